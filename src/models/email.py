@@ -1,11 +1,59 @@
 """Email-related data models."""
 
+from collections.abc import Iterable
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, EmailStr, Field, PrivateAttr, validator
+
+try:
+    from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader, Template
+
+    JINJA2_AVAILABLE = True
+except ImportError:
+    JINJA2_AVAILABLE = False
+    Environment = None
+    Template = None
+
+
+def _load_source(source: str) -> tuple[str, None, Any]:
+    """Jinja2 loader treating the template name as its own source."""
+    return source, None, lambda: True
+
+
+# Inside the application's cache directory (the caching service's default),
+# not Jinja's shared per-user temp directory
+_BYTECODE_CACHE_DIR = Path(".cache") / "jinja2"
+
+
+def _make_jinja_env(autoescape: bool) -> "Environment":
+    """Create a Jinja2 environment whose compiled bytecode persists across runs.
+
+    Templates are looked up by their source string so ``get_template`` goes
+    through the bytecode cache (``from_string`` bypasses it). Sources are
+    baked into code, so ``auto_reload`` is off. If the cache directory can't
+    be created, templates are compiled in memory only.
+    """
+    try:
+        _BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(_BYTECODE_CACHE_DIR))
+    except (OSError, RuntimeError):
+        bytecode_cache = None
+    return Environment(
+        loader=FunctionLoader(_load_source),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        autoescape=autoescape,
+        keep_trailing_newline=True,
+    )
+
+
+if JINJA2_AVAILABLE:
+    # Plain-text parts are rendered verbatim; only the HTML part is escaped
+    _TEXT_ENV = _make_jinja_env(autoescape=False)
+    _HTML_ENV = _make_jinja_env(autoescape=True)
 
 
 class EmailPriority(str, Enum):
@@ -102,6 +150,10 @@ class EmailMessage(BaseModel):
     error_message: str | None = None
     retry_count: int = 0
     max_retries: int = 3
+    next_attempt_at: float | None = None  # time.monotonic() deadline while queued
+
+    # Wire-format MIME bytes from the first send attempt, reused on retries
+    _cached_mime: bytes | None = PrivateAttr(default=None)
 
     @validator("recipients")
     def validate_recipients(cls, v: list[EmailRecipient]) -> list[EmailRecipient]:
@@ -146,6 +198,17 @@ class EmailMessage(BaseModel):
         recipient = EmailRecipient(email=email, name=name, recipient_type=recipient_type)
         self.recipients.append(recipient)
 
+    def add_recipients(self, emails: Iterable[str], recipient_type: str = "to") -> None:
+        """Add several recipients of the same type in one call.
+
+        Args:
+            emails: Email addresses.
+            recipient_type: Type of recipient.
+        """
+        self.recipients.extend(
+            EmailRecipient(email=email, recipient_type=recipient_type) for email in emails
+        )
+
     def add_attachment(self, file_path: Path, filename: str | None = None) -> None:
         """Add an attachment from file.
 
@@ -207,6 +270,9 @@ class EmailTemplate(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    # Compiled Jinja2 templates keyed by (source, is_html), built on first use
+    _compiled: dict[tuple[str, bool], Any] = PrivateAttr(default_factory=dict)
+
     @validator("template_id")
     def validate_template_id(cls, v: str) -> str:
         """Validate template ID format."""
@@ -238,11 +304,14 @@ class EmailTemplate(BaseModel):
 
         return list(variables)
 
-    def render(self, variables: dict[str, Any]) -> EmailMessage:
+    def render(
+        self, variables: dict[str, Any], recipients: list[EmailRecipient] | None = None
+    ) -> EmailMessage:
         """Render template with variables.
 
         Args:
             variables: Dictionary of template variables.
+            recipients: Message recipients; at least one "to" recipient is required.
 
         Returns:
             Rendered EmailMessage.
@@ -252,17 +321,26 @@ class EmailTemplate(BaseModel):
         if missing:
             raise ValueError(f"Missing template variables: {missing}")
 
-        # Simple template rendering (in production, use Jinja2)
-        subject = self.subject_template
-        body = self.body_template
-        body_html = self.body_html_template
-
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            subject = subject.replace(placeholder, str(value))
-            body = body.replace(placeholder, str(value))
-            if body_html:
-                body_html = body_html.replace(placeholder, str(value))
+        if JINJA2_AVAILABLE:
+            subject = self._get_compiled(self.subject_template).render(variables)
+            body = self._get_compiled(self.body_template).render(variables)
+            body_html = (
+                self._get_compiled(self.body_html_template, is_html=True).render(variables)
+                if self.body_html_template
+                else None
+            )
+        else:
+            # Fallback: plain placeholder substitution
+            subject = self.subject_template
+            body = self.body_template
+            body_html = self.body_html_template
+
+            for key, value in variables.items():
+                placeholder = f"{{{{{key}}}}}"
+                subject = subject.replace(placeholder, str(value))
+                body = body.replace(placeholder, str(value))
+                if body_html:
+                    body_html = body_html.replace(placeholder, str(value))
 
         # Create email message
         return EmailMessage(
@@ -271,10 +349,40 @@ class EmailTemplate(BaseModel):
             body_html=body_html,
             sender=variables.get("sender", "noreply@resourceallocation.com"),
             sender_name=variables.get("sender_name"),
-            recipients=[],  # Recipients should be added separately
+            recipients=recipients or [],
             metadata={"template_id": self.template_id, "template_name": self.name},
         )
 
+    def compile(self) -> None:
+        """Compile the subject and body templates ahead of the first render.
+
+        No-op when Jinja2 is not installed.
+        """
+        if not JINJA2_AVAILABLE:
+            return
+
+        self._get_compiled(self.subject_template)
+        self._get_compiled(self.body_template)
+        if self.body_html_template:
+            self._get_compiled(self.body_html_template, is_html=True)
+
+    def _get_compiled(self, source: str, is_html: bool = False) -> "Template":
+        """Get the compiled Jinja2 template for ``source``, compiling it once.
+
+        Args:
+            source: Template source string.
+            is_html: Whether to compile with HTML autoescaping.
+
+        Returns:
+            Compiled Jinja2 template.
+        """
+        key = (source, is_html)
+        template = self._compiled.get(key)
+        if template is None:
+            env = _HTML_ENV if is_html else _TEXT_ENV
+            template = self._compiled[key] = env.get_template(source)
+        return template
+
     def validate_template(self) -> bool:
         """Validate template syntax.
 
@@ -311,6 +419,8 @@ class EmailConfiguration(BaseModel):
     enabled: bool = False
     smtp_host: str = "smtp.gmail.com"
     smtp_port: int = 587
+    smtp_hosts: list[str] = Field(default_factory=list)  # relay cluster; overrides smtp_host
+    host_cooldown: int = 60  # seconds a failed relay is skipped
     use_tls: bool = True
     use_ssl: bool = False
     username: str | None = None
@@ -322,8 +432,12 @@ class EmailConfiguration(BaseModel):
     cc_recipients: list[EmailStr] = Field(default_factory=list)
     bcc_recipients: list[EmailStr] = Field(default_factory=list)
     max_retries: int = 3
-    retry_delay: int = 60  # seconds
+    retry_delay: int = 60  # seconds, doubled on each further retry
+    max_retry_delay: int = 1800  # seconds, cap on the backoff
     timeout: int = 30  # seconds
+    max_messages_per_connection: int = 1000  # recycle pooled SMTP connection after this many
+    enqueue_only: bool = False  # hand notifications to background workers
+    workers: int = 2  # worker threads (each with its own connection) in enqueue-only mode
     debug: bool = False
 
     @validator("smtp_port")
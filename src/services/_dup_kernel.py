@@ -0,0 +1,35 @@
+"""Counting and grouping kernel for duplicate vehicle detection.
+
+Kept free of project imports and fully annotated so it can be compiled with
+mypyc (``mypyc src/services/_dup_kernel.py``). A compiled extension placed
+next to this file takes import precedence; otherwise this pure-Python module
+is used as-is.
+"""
+
+from collections import Counter
+from typing import Any
+
+
+def count_van_ids(rows: list[dict[str, Any]]) -> dict[str, int]:
+    """Count occurrences of each non-empty string "Van ID" in ``rows``."""
+    # Counter consumes the generator in C (_count_elements); only the rows
+    # that survive this count are ever grouped or turned into objects.
+    return Counter(
+        van_id for row in rows if isinstance(van_id := row.get("Van ID"), str) and van_id
+    )
+
+
+def collect_duplicate_rows(
+    rows: list[dict[str, Any]], dup_ids: set[str]
+) -> dict[str, list[dict[str, Any]]]:
+    """Group rows whose "Van ID" is in ``dup_ids``, in first-seen order."""
+    groups: dict[str, list[dict[str, Any]]] = {}
+    if not dup_ids:
+        return groups
+    add = groups.setdefault
+    _isinstance = isinstance
+    for row in rows:
+        van_id = row.get("Van ID")
+        if _isinstance(van_id, str) and van_id in dup_ids:
+            add(van_id, []).append(row)
+    return groups
@@ -0,0 +1,93 @@
+"""Process-wide cache of parsed Excel workbooks and sheets.
+
+The dashboard and data management services both read the Daily Summary Log
+on periodic GUI refreshes. Routing their reads through this module means the
+workbook is parsed once per process and only re-read when the file's mtime
+changes on disk.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+# Parsed sheets are kept for this many workbook paths, least recently used
+# dropped first, so dated files opened over a long session don't pile up
+_MAX_PATHS = 16
+
+# path -> (mtime_ns, {sheet: DataFrame}), most recently used last
+_sheets: OrderedDict[str, tuple[int, dict[str, pd.DataFrame]]] = OrderedDict()
+# The last opened workbook as (path, mtime_ns, workbook), so reading a second
+# sheet of the same file doesn't reopen it. Only one is kept, and a reader
+# takes it out of the slot while parsing so it's never used by two threads.
+# The workbook is opened over an in-memory copy of the file so no handle is
+# held on the source (Excel locks open files).
+_book: tuple[str, int, pd.ExcelFile] | None = None
+_lock = threading.Lock()
+
+
+def get_sheet_df(path: str | Path, sheet: str) -> pd.DataFrame:
+    """Return ``sheet`` from the workbook at ``path`` as a DataFrame.
+
+    The result is shared between callers and must be treated as read-only.
+    Parsing happens outside the cache lock, so a slow workbook doesn't hold
+    up reads of other files.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the sheet does not exist.
+    """
+    global _book
+
+    key = str(path)
+    mtime = Path(key).stat().st_mtime_ns
+
+    with _lock:
+        cached = _sheets.get(key)
+        if cached and cached[0] == mtime and sheet in cached[1]:
+            _sheets.move_to_end(key)
+            return cached[1][sheet]
+
+        book = None
+        if _book is not None and _book[:2] == (key, mtime):
+            book, _book = _book[2], None
+
+    if book is None:
+        book = pd.ExcelFile(BytesIO(Path(key).read_bytes()))
+    try:
+        df = book.parse(sheet_name=sheet)
+    except Exception:
+        book.close()
+        raise
+
+    with _lock:
+        cached = _sheets.get(key)
+        if not cached or cached[0] != mtime:
+            # Sheets parsed from another version of the file are dropped
+            cached = (mtime, {})
+            _sheets[key] = cached
+        # A concurrent reader may have published the same sheet first
+        df = cached[1].setdefault(sheet, df)
+        _sheets.move_to_end(key)
+        while len(_sheets) > _MAX_PATHS:
+            _sheets.popitem(last=False)
+
+        previous, _book = _book, (key, mtime, book)
+    if previous is not None:
+        previous[2].close()
+    return df
+
+
+def clear() -> None:
+    """Drop all cached workbooks and sheets."""
+    global _book
+
+    with _lock:
+        _sheets.clear()
+        previous, _book = _book, None
+    if previous is not None:
+        previous[2].close()
@@ -15,11 +15,14 @@ from time import time
 import pandas as pd
 from loguru import logger
 
+from src.services._excel_cache import get_sheet_df
+
 
 @dataclass
 class _CacheEntry:
-    value: int
+    value: int | None
     timestamp: float
+    mtime_ns: int
 
 
 class DashboardDataService:
@@ -30,8 +33,10 @@ class DashboardDataService:
       2) config/settings.json if use_default_daily_summary is true
       3) inputs/Daily Summary Log 2025.xlsx if present
     - Safely reads Excel sheets with defensive fallbacks.
-    - Caches results briefly to avoid repeated disk reads while the
-      status bar triggers periodic dashboard refreshes.
+    - Caches results (including ``None`` for unusable sheets) keyed by the
+      file's mtime, so periodic dashboard refreshes only re-read a file after
+      it changes. Within the TTL the file is not even stat'ed. Workbook
+      parsing is shared with other services via ``src.services._excel_cache``.
     """
 
     def __init__(self, cache_ttl_seconds: int = 15):
@@ -68,29 +73,60 @@ class DashboardDataService:
 
         return None
 
+    # ---------- Cache helpers ----------
+    def _cache_lookup(
+        self, cache: dict[str, _CacheEntry], key: str, now: float
+    ) -> tuple[bool, int | None, int]:
+        """Return (hit, value, mtime_ns) for ``key``.
+
+        Within the TTL an entry is trusted without touching the disk; after
+        that it stays valid for as long as the file's mtime is unchanged.
+        """
+        entry = cache.get(key)
+        if entry and (now - entry.timestamp) < self.cache_ttl:
+            return True, entry.value, entry.mtime_ns
+
+        mtime_ns = Path(key).stat().st_mtime_ns
+        if entry and entry.mtime_ns == mtime_ns:
+            entry.timestamp = now
+            return True, entry.value, mtime_ns
+        return False, None, mtime_ns
+
     # ---------- Metrics readers ----------
     def total_operational_vehicles(self, daily_summary_path: str | None) -> int | None:
         """Count operational vehicles from Vehicle Status sheet.
 
-        Returns None on any issue (missing file/sheet/columns).
-        Caches for a short TTL.
+        Returns None on any issue (missing file/sheet/columns). Results,
+        including None for sheets missing required columns, are cached until
+        the file changes.
         """
         path = self.resolve_daily_summary_path(daily_summary_path)
         if not path:
             return None
 
-        # Cache check
         now = time()
-        cache = self._veh_cache.get(path)
-        if cache and (now - cache.timestamp) < self.cache_ttl:
-            return cache.value
+        try:
+            hit, value, mtime_ns = self._cache_lookup(self._veh_cache, path, now)
+        except OSError as e:
+            logger.debug(f"Vehicle Status stat failed for {path}: {e}")
+            return None
+        if hit:
+            return value
 
+        logger.debug(f"Vehicle Status cache miss for {path}")
         try:
-            df = pd.read_excel(path, sheet_name="Vehicle Status")
+            df = get_sheet_df(path, "Vehicle Status")
         except Exception as e:
+            # Not cached: read failures may be transient (e.g. file mid-save)
             logger.debug(f"Vehicle Status read failed from {path}: {e}")
             return None
 
+        count = self._count_operational_vehicles(df)
+        self._veh_cache[path] = _CacheEntry(value=count, timestamp=now, mtime_ns=mtime_ns)
+        return count
+
+    @staticmethod
+    def _count_operational_vehicles(df: pd.DataFrame) -> int | None:
         # Column normalization
         cols = {c.lower().strip(): c for c in df.columns}
         van_col = cols.get("van id") or cols.get("vehicle id")
@@ -104,14 +140,11 @@ class DashboardDataService:
             oper = df[df[op_col].astype(str).str.upper() == "Y"]
             if van_col not in oper.columns:
                 return None
-            count = int(oper[van_col].dropna().astype(str).str.strip().nunique())
+            return int(oper[van_col].dropna().astype(str).str.strip().nunique())
         except Exception as e:
             logger.debug(f"Vehicle count computation failed: {e}")
             return None
 
-        self._veh_cache[path] = _CacheEntry(value=count, timestamp=now)
-        return count
-
     def total_drivers(self, daily_routes_path: str | None) -> int | None:
         """Count distinct drivers from Daily Routes (Routes sheet)."""
         if not daily_routes_path:
@@ -120,18 +153,28 @@ class DashboardDataService:
         if not p.exists():
             return None
 
-        # Cache key by path
         now = time()
-        cache = self._drv_cache.get(str(p))
-        if cache and (now - cache.timestamp) < self.cache_ttl:
-            return cache.value
+        try:
+            hit, value, mtime_ns = self._cache_lookup(self._drv_cache, str(p), now)
+        except OSError as e:
+            logger.debug(f"Daily Routes stat failed for {p}: {e}")
+            return None
+        if hit:
+            return value
 
+        logger.debug(f"Daily Routes cache miss for {p}")
         try:
-            df = pd.read_excel(str(p), sheet_name="Routes")
+            df = get_sheet_df(p, "Routes")
         except Exception as e:
             logger.debug(f"Daily Routes read failed from {p}: {e}")
             return None
 
+        count = self._count_drivers(df)
+        self._drv_cache[str(p)] = _CacheEntry(value=count, timestamp=now, mtime_ns=mtime_ns)
+        return count
+
+    @staticmethod
+    def _count_drivers(df: pd.DataFrame) -> int | None:
         # Normalize column names
         cols = {c.lower().strip(): c for c in df.columns}
         driver_col = cols.get("driver name") or cols.get("driver")
@@ -140,7 +183,7 @@ class DashboardDataService:
             return None
 
         try:
-            count = int(
+            return int(
                 df[driver_col]
                 .dropna()
                 .astype(str)
@@ -152,6 +195,3 @@ class DashboardDataService:
         except Exception as e:
             logger.debug(f"Driver count computation failed: {e}")
             return None
-
-        self._drv_cache[str(p)] = _CacheEntry(value=count, timestamp=now)
-        return count
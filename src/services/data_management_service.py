@@ -16,6 +16,8 @@ from time import time
 import pandas as pd
 from loguru import logger
 
+from src.services._excel_cache import get_sheet_df
+
 
 @dataclass
 class _CacheEntry:
@@ -62,22 +64,15 @@ class DataManagementService:
     def load_vehicle_status(self, daily_summary_path: str | None) -> pd.DataFrame | None:
         """Load Vehicle Status sheet as DataFrame (raw columns).
 
-        Returns None on failure. Short-lived cache keyed by file path.
+        Returns None on failure. Parsed sheets are shared process-wide and
+        reused until the file changes on disk.
         """
         path = self.resolve_daily_summary_path(daily_summary_path)
         if not path:
             return None
 
-        key = f"veh_status::{path}"
-        now = time()
-        entry = self._cache.get(key)
-        if entry and (now - entry.ts) < self.cache_ttl:
-            return entry.df
-
         try:
-            df = pd.read_excel(path, sheet_name="Vehicle Status")
-            self._cache[key] = _CacheEntry(df=df, ts=now)
-            return df
+            return get_sheet_df(path, "Vehicle Status")
         except Exception as e:
             logger.debug(f"Failed to read Vehicle Status from {path}: {e}")
             return None
@@ -88,16 +83,8 @@ class DataManagementService:
         if not path:
             return None
 
-        key = f"veh_log::{path}"
-        now = time()
-        entry = self._cache.get(key)
-        if entry and (now - entry.ts) < self.cache_ttl:
-            return entry.df
-
         try:
-            df = pd.read_excel(path, sheet_name="Vehicle Log")
-            self._cache[key] = _CacheEntry(df=df, ts=now)
-            return df
+            return get_sheet_df(path, "Vehicle Log")
         except Exception as e:
             logger.debug(f"Vehicle Log not available or failed to read from {path}: {e}")
             return None
@@ -1,15 +1,79 @@
 """Duplicate vehicle assignment validator service."""
 
-from collections import defaultdict
+import json
+import sys
+from collections import Counter
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
+from typing import Any
 
 from loguru import logger
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 from src.core.base_service import BaseService
+from src.services._dup_kernel import collect_duplicate_rows, count_van_ids
+
+_route_and_driver = attrgetter("route_code", "driver_name")
+_UNKNOWN_WAVE = 9999  # Sorts after any valid time of day (max 23 * 60 + 59)
+
+
+@lru_cache(maxsize=512)
+def _parse_wave_time(wave_str: str) -> int:
+    """Parse a wave time string like "8:00 AM" to minutes since midnight."""
+    hour_str, colon, rest = wave_str.upper().partition(":")
+    minute_str = rest[:2]
+    # Accept the same shape as the pattern (\d{1,2}):(\d{2})\s*(AM|PM)? at the start
+    if not (
+        colon
+        and 1 <= len(hour_str) <= 2
+        and hour_str.isdecimal()
+        and len(minute_str) == 2
+        and minute_str.isdecimal()
+    ):
+        return _UNKNOWN_WAVE
+
+    hour = int(hour_str)
+    minute = int(minute_str)
+    period = rest[2:].lstrip()[:2]
+
+    # Convert to 24-hour format
+    if period == "PM" and hour != 12:
+        hour += 12
+    elif period == "AM" and hour == 12:
+        hour = 0
+
+    return hour * 60 + minute
+
+
+@lru_cache(maxsize=1024)
+def _suggest_resolution_impl(pairs: tuple[tuple[str, str], ...]) -> str:
+    """Build a resolution suggestion from ((wave, route_code), ...) pairs."""
+    if len(pairs) <= 1:
+        return "Review assignments and remove duplicates"
 
+    # Sort by wave time to suggest keeping earliest; keys are computed once
+    # up front and the index keeps ties in their original order
+    keyed = sorted((_parse_wave_time(wave), i, route) for i, (wave, route) in enumerate(pairs))
+    keep_route = keyed[0][2]
+    remove_routes = [route for _, _, route in keyed[1:]]
+    return (
+        f"Suggestion: Keep assignment to route {keep_route}, "
+        f"remove from routes: {', '.join(remove_routes)}"
+    )
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class VehicleAssignment:
     """Represents a single vehicle assignment."""
 
@@ -19,10 +83,10 @@ class VehicleAssignment:
     service_type: str
     wave: str
     staging_location: str
-    assignment_timestamp: datetime = field(default_factory=datetime.now)
+    assignment_timestamp: datetime | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DuplicateAssignment:
     """Represents a duplicate vehicle assignment conflict."""
 
@@ -30,15 +94,23 @@ class DuplicateAssignment:
     assignments: list[VehicleAssignment]
     conflict_level: str = "warning"  # "warning" or "error"
     resolution_suggestion: str = ""
+    _summary_cache: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def get_conflict_summary(self) -> str:
-        """Get a human-readable summary of the conflict."""
-        routes = [a.route_code for a in self.assignments]
-        drivers = [a.driver_name for a in self.assignments]
-        return (
-            f"Vehicle {self.vehicle_id} assigned to multiple routes: "
-            f"{', '.join(routes)} (Drivers: {', '.join(drivers)})"
-        )
+        """Get a human-readable summary of the conflict.
+
+        Built on first call and cached; ``assignments`` is not expected to
+        change once the conflict has been reported.
+        """
+        if self._summary_cache is None:
+            # One pass over the assignments yields both columns
+            pairs = list(map(_route_and_driver, self.assignments))
+            routes, drivers = zip(*pairs, strict=True) if pairs else ((), ())
+            self._summary_cache = (
+                f"Vehicle {self.vehicle_id} assigned to multiple routes: "
+                f"{', '.join(routes)} (Drivers: {', '.join(drivers)})"
+            )
+        return self._summary_cache
 
 
 @dataclass
@@ -49,6 +121,9 @@ class ValidationResult:
     duplicate_count: int = 0
     duplicates: dict[str, DuplicateAssignment] = field(default_factory=dict)
     warnings: list[str] = field(default_factory=list)
+    # Whether any duplicate is an error; validators set this at build time,
+    # otherwise it is derived from ``duplicates`` on first use
+    has_errors: bool | None = None
 
     def has_duplicates(self) -> bool:
         """Check if any duplicates were found."""
@@ -60,8 +135,11 @@ class ValidationResult:
             return "✅ No duplicate vehicle assignments detected"
         else:
             # Duplicates found - check conflict level for appropriate icon
-            has_errors = any(dup.conflict_level == "error" for dup in self.duplicates.values())
-            icon = "❌" if has_errors else "⚠️"
+            if self.has_errors is None:
+                self.has_errors = any(
+                    dup.conflict_level == "error" for dup in self.duplicates.values()
+                )
+            icon = "❌" if self.has_errors else "⚠️"
             return f"{icon} Found {self.duplicate_count} vehicles assigned to multiple routes"
 
 
@@ -141,30 +219,45 @@ class DuplicateVehicleValidator(BaseService):
         """
         logger.info(f"Validating {len(allocation_results)} allocations for duplicates")
 
-        # Track vehicle assignments
-        vehicle_assignments: dict[str, list[VehicleAssignment]] = defaultdict(list)
-
-        # Build assignment map
-        for result in allocation_results:
-            # Skip invalid entries (None, non-dict, etc.)
-            if not isinstance(result, dict):
-                logger.warning(f"Skipping invalid allocation entry: {type(result).__name__}")
-                continue
-
-            van_id = result.get("Van ID")
-            if not van_id or not isinstance(van_id, str):
-                continue
-
-            assignment = VehicleAssignment(
-                vehicle_id=van_id,
-                route_code=str(result.get("Route Code", "Unknown")),
-                driver_name=str(result.get("Associate Name", "N/A")),
-                service_type=str(result.get("Service Type", "Unknown")),
-                wave=str(result.get("Wave", "Unknown")),
-                staging_location=str(result.get("Staging Location", "Unknown")),
+        # Skip invalid entries (None, non-dict, etc.)
+        _isinstance = isinstance
+        rows = [r for r in allocation_results if _isinstance(r, dict)]
+        if len(rows) != len(allocation_results):
+            skipped = {type(r).__name__ for r in allocation_results if not _isinstance(r, dict)}
+            logger.warning(
+                f"Skipping {len(allocation_results) - len(rows)} invalid allocation entries: "
+                f"{', '.join(sorted(skipped))}"
             )
 
-            vehicle_assignments[van_id].append(assignment)
+        # Count Van IDs first so VehicleAssignment objects are only built for
+        # the (typically few) vehicles that are over the limit.
+        counts = count_van_ids(rows)
+        dup_ids = {v for v, c in counts.items() if c > self.max_assignments_per_vehicle}
+
+        # Build assignment map for duplicated vehicles only, stamped with one
+        # timestamp for the whole batch
+        now = datetime.now()
+        # Bind hot names locally to avoid global/builtin lookups per row
+        mk = VehicleAssignment
+        _str = str
+        # Service type, wave and staging location repeat heavily; interning
+        # lets equal values share one string object
+        intern = sys.intern
+        vehicle_assignments: dict[str, list[VehicleAssignment]] = {
+            van_id: [
+                mk(
+                    vehicle_id=van_id,
+                    route_code=_str(result.get("Route Code", "Unknown")),
+                    driver_name=_str(result.get("Associate Name", "N/A")),
+                    service_type=intern(_str(result.get("Service Type", "Unknown"))),
+                    wave=intern(_str(result.get("Wave", "Unknown"))),
+                    staging_location=intern(_str(result.get("Staging Location", "Unknown"))),
+                    assignment_timestamp=now,
+                )
+                for result in group
+            ]
+            for van_id, group in collect_duplicate_rows(rows, dup_ids).items()
+        }
 
         # Find duplicates
         duplicates = {}
@@ -185,7 +278,11 @@ class DuplicateVehicleValidator(BaseService):
                 duplicates[vehicle_id] = duplicate
                 warnings.append(duplicate.get_conflict_summary())
 
-                logger.warning(f"Duplicate assignment detected: {duplicate.get_conflict_summary()}")
+        # One log record for the whole batch rather than one per vehicle
+        if warnings:
+            logger.warning(
+                f"Duplicate assignments detected ({len(warnings)}):\n" + "\n".join(warnings)
+            )
 
         # Create validation result
         result = ValidationResult(
@@ -193,42 +290,23 @@ class DuplicateVehicleValidator(BaseService):
             duplicate_count=len(duplicates),
             duplicates=duplicates,
             warnings=warnings,
+            has_errors=bool(duplicates and self.strict_mode),
         )
 
         logger.info(f"Validation complete: {result.get_summary()}")
         return result
 
-    def _parse_wave_time(self, wave_str: str) -> tuple[int, int]:
+    def _parse_wave_time(self, wave_str: str) -> int:
         """
-        Parse wave time string to sortable tuple (hour_24, minute).
+        Parse wave time string to a sortable integer (minutes since midnight).
 
         Args:
             wave_str: Wave time string like "8:00 AM" or "11:30 PM"
 
         Returns:
-            Tuple of (hour_24, minute) for sorting
+            Minutes since midnight, or a large sentinel so unknown times sort last
         """
-        try:
-            import re
-
-            # Extract time components
-            match = re.match(r"(\d{1,2}):(\d{2})\s*(AM|PM)?", str(wave_str).upper())
-            if not match:
-                return (99, 99)  # Sort unknown times last
-
-            hour = int(match.group(1))
-            minute = int(match.group(2))
-            period = match.group(3)
-
-            # Convert to 24-hour format
-            if period == "PM" and hour != 12:
-                hour += 12
-            elif period == "AM" and hour == 12:
-                hour = 0
-
-            return (hour, minute)
-        except Exception:
-            return (99, 99)  # Sort errors last
+        return _parse_wave_time(str(wave_str))
 
     def _suggest_resolution(self, assignments: list[VehicleAssignment]) -> str:
         """
@@ -240,18 +318,8 @@ class DuplicateVehicleValidator(BaseService):
         Returns:
             Resolution suggestion string.
         """
-        # Sort by wave time to suggest keeping earliest
-        sorted_assignments = sorted(assignments, key=lambda a: self._parse_wave_time(a.wave))
-
-        if len(sorted_assignments) > 1:
-            keep_route = sorted_assignments[0].route_code
-            remove_routes = [a.route_code for a in sorted_assignments[1:]]
-            return (
-                f"Suggestion: Keep assignment to route {keep_route}, "
-                f"remove from routes: {', '.join(remove_routes)}"
-            )
-
-        return "Review assignments and remove duplicates"
+        # Identical (wave, route) patterns recur across groups and runs
+        return _suggest_resolution_impl(tuple((str(a.wave), a.route_code) for a in assignments))
 
     def validate_driver_vehicles(self, allocations: dict[str, list[str]]) -> ValidationResult:
         """
@@ -265,14 +333,22 @@ class DuplicateVehicleValidator(BaseService):
         """
         logger.info("Validating driver-vehicle allocations")
 
-        # Invert the mapping to check for duplicate vehicles
-        vehicle_to_drivers: dict[str, list[str]] = defaultdict(list)
+        # Count first; only vehicles held by more than one driver are inverted
+        counts = Counter(chain.from_iterable(allocations.values()))
+        dup_vids = {v for v, c in counts.items() if c > 1}
+        if not dup_vids:
+            return ValidationResult(is_valid=True, has_errors=False)
+
+        vehicle_to_drivers: dict[str, list[str]] = {}
+        add = vehicle_to_drivers.setdefault
 
         for driver_id, vehicle_ids in allocations.items():
             for vehicle_id in vehicle_ids:
-                vehicle_to_drivers[vehicle_id].append(driver_id)
+                if vehicle_id in dup_vids:
+                    add(vehicle_id, []).append(driver_id)
 
         # Find vehicles assigned to multiple drivers
+        now = datetime.now()
         duplicates = {}
         warnings = []
 
@@ -287,6 +363,7 @@ class DuplicateVehicleValidator(BaseService):
                         service_type="N/A",
                         wave="N/A",
                         staging_location="N/A",
+                        assignment_timestamp=now,
                     )
                     for driver_id in driver_ids
                 ]
@@ -303,13 +380,19 @@ class DuplicateVehicleValidator(BaseService):
                     f"{', '.join(driver_ids)}"
                 )
                 warnings.append(warning_msg)
-                logger.warning(warning_msg)
+
+        if warnings:
+            logger.warning(
+                f"Duplicate driver-vehicle assignments detected ({len(warnings)}):\n"
+                + "\n".join(warnings)
+            )
 
         result = ValidationResult(
             is_valid=len(duplicates) == 0 or not self.strict_mode,
             duplicate_count=len(duplicates),
             duplicates=duplicates,
             warnings=warnings,
+            has_errors=bool(duplicates and self.strict_mode),
         )
 
         return result
@@ -330,26 +413,23 @@ class DuplicateVehicleValidator(BaseService):
         if not validation_result.has_duplicates():
             return allocation_results
 
-        # Create a copy to avoid modifying original
-        marked_results = []
-
-        for result in allocation_results:
-            result_copy = result.copy()
-            van_id = result_copy.get("Van ID")
-
-            if van_id and van_id in validation_result.duplicates:
-                duplicate = validation_result.duplicates[van_id]
-                result_copy["Validation Status"] = "DUPLICATE"
-                result_copy["Validation Warning"] = duplicate.get_conflict_summary()
-                result_copy["Conflict Level"] = duplicate.conflict_level
-            else:
-                result_copy["Validation Status"] = "OK"
-                result_copy["Validation Warning"] = ""
-                result_copy["Conflict Level"] = ""
-
-            marked_results.append(result_copy)
+        # Build each vehicle's marker columns once instead of per matching row
+        ok_marker = {"Validation Status": "OK", "Validation Warning": "", "Conflict Level": ""}
+        markers = {
+            vid: {
+                "Validation Status": "DUPLICATE",
+                "Validation Warning": dup.get_conflict_summary(),
+                "Conflict Level": dup.conflict_level,
+            }
+            for vid, dup in validation_result.duplicates.items()
+        }
+        get_marker = markers.get
 
-        return marked_results
+        # Build new dicts to avoid modifying the originals
+        return [
+            {**result, **get_marker(result.get("Van ID"), ok_marker)}
+            for result in allocation_results
+        ]
 
     def generate_duplicate_report(self, validation_result: ValidationResult) -> dict[str, any]:
         """
@@ -361,16 +441,36 @@ class DuplicateVehicleValidator(BaseService):
         Returns:
             Report dictionary with detailed duplicate information.
         """
-        report = {
+        return {
             "timestamp": datetime.now().isoformat(),
             "summary": validation_result.get_summary(),
             "duplicate_count": validation_result.duplicate_count,
             "is_valid": validation_result.is_valid,
-            "duplicates": [],
+            "duplicates": list(self._iter_duplicate_info(validation_result)),
         }
 
+    def generate_duplicate_report_json(self, validation_result: ValidationResult) -> bytes:
+        """
+        Generate the duplicate report serialized as UTF-8 JSON.
+
+        Uses orjson when installed, falling back to the standard library.
+
+        Args:
+            validation_result: Validation result to report on.
+
+        Returns:
+            JSON-encoded report with the same shape as generate_duplicate_report.
+        """
+        report = self.generate_duplicate_report(validation_result)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(report)
+        return json.dumps(report, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _iter_duplicate_info(validation_result: ValidationResult) -> Iterator[dict[str, Any]]:
+        """Yield one report entry per duplicated vehicle."""
         for vehicle_id, duplicate in validation_result.duplicates.items():
-            duplicate_info = {
+            yield {
                 "vehicle_id": vehicle_id,
                 "conflict_level": duplicate.conflict_level,
                 "assignment_count": len(duplicate.assignments),
@@ -382,11 +482,10 @@ class DuplicateVehicleValidator(BaseService):
                         "service_type": a.service_type,
                         "wave": a.wave,
                         "staging_location": a.staging_location,
-                        "timestamp": a.assignment_timestamp.isoformat(),
+                        "timestamp": (
+                            a.assignment_timestamp.isoformat() if a.assignment_timestamp else None
+                        ),
                     }
                     for a in duplicate.assignments
                 ],
             }
-            report["duplicates"].append(duplicate_info)
-
-        return report
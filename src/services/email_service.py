@@ -1,14 +1,19 @@
 """Email service for sending notifications."""
 
-import smtplib
+from __future__ import annotations
+
+import binascii
+import heapq
+import itertools
+import mmap
+import queue
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime
-from email import encoders
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
@@ -18,10 +23,118 @@ from src.models.email import (
     EmailConfiguration,
     EmailMessage,
     EmailPriority,
+    EmailRecipient,
     EmailStatus,
     EmailTemplate,
 )
 
+if TYPE_CHECKING:
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+
+# smtplib and email.mime are imported where used so that processes with
+# email disabled never load them at startup
+
+_HIGH_PRIORITIES = frozenset({EmailPriority.HIGH, EmailPriority.URGENT})
+_HIGH_PRIORITY_HEADERS = (("X-Priority", "1"), ("Importance", "high"))
+# Raw bytes per 76-character base64 line
+_BASE64_CHUNK = 57
+
+
+# Encoded attachments kept for reuse, capped by total encoded size; larger
+# attachments are encoded on every send rather than cached
+_ATTACHMENT_CACHE_MAX_CHARS = 8 * 1024 * 1024
+# path -> (mtime_ns, size, encoded), least recently used first
+_attachment_cache: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+_attachment_cache_chars = 0
+_attachment_cache_lock = threading.Lock()
+
+
+def _encoded_attachment(path: str, mtime_ns: int, size: int) -> str:
+    """Base64-encode a file's bytes for a MIME part.
+
+    A report attached to several notifications is encoded once. Only the
+    latest version of each path is cached, so a rewritten file replaces its
+    old entry, and the least recently used entries are evicted once the
+    cache holds more than ``_ATTACHMENT_CACHE_MAX_CHARS`` encoded characters.
+    """
+    global _attachment_cache_chars
+
+    with _attachment_cache_lock:
+        cached = _attachment_cache.get(path)
+        if cached and cached[:2] == (mtime_ns, size):
+            _attachment_cache.move_to_end(path)
+            return cached[2]
+
+    if size == 0:
+        encoded = ""
+    else:
+        # Map the file instead of reading it so only the encoded copy is held
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            encoded = _encode_base64(mapped)
+
+    with _attachment_cache_lock:
+        previous = _attachment_cache.pop(path, None)
+        if previous:
+            _attachment_cache_chars -= len(previous[2])
+        if len(encoded) <= _ATTACHMENT_CACHE_MAX_CHARS:
+            _attachment_cache[path] = (mtime_ns, size, encoded)
+            _attachment_cache_chars += len(encoded)
+            while _attachment_cache_chars > _ATTACHMENT_CACHE_MAX_CHARS:
+                _, (_, _, evicted) = _attachment_cache.popitem(last=False)
+                _attachment_cache_chars -= len(evicted)
+    return encoded
+
+
+def _clear_attachment_cache() -> None:
+    """Drop all cached encoded attachments."""
+    global _attachment_cache_chars
+
+    with _attachment_cache_lock:
+        _attachment_cache.clear()
+        _attachment_cache_chars = 0
+
+
+def _encode_base64(data: bytes | mmap.mmap) -> str:
+    """Base64-encode ``data`` as 76-column MIME lines.
+
+    Encodes 57-byte chunks with the C ``binascii.b2a_base64`` so each call
+    emits exactly one line, matching ``email.encoders.encode_base64`` output.
+    """
+    b2a = binascii.b2a_base64
+    encoded = bytearray()
+    for i in range(0, len(data), _BASE64_CHUNK):
+        encoded += b2a(data[i : i + _BASE64_CHUNK])
+    return encoded.decode("ascii")
+
+
+def _is_transport_error(error: BaseException) -> bool:
+    """Whether an SMTP failure means the connection or relay itself is unusable.
+
+    ``smtplib.SMTPException`` subclasses ``OSError``, so replies such as
+    refused recipients or bad credentials must be told apart from dropped
+    connections, refused connects and socket timeouts.
+    """
+    import smtplib
+
+    if isinstance(error, smtplib.SMTPServerDisconnected | smtplib.SMTPConnectError):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class _SmtpSession:
+    """An SMTP connection, the relay it is connected to and the messages sent over it."""
+
+    __slots__ = ("connection", "host", "messages_sent")
+
+    def __init__(self) -> None:
+        self.connection: smtplib.SMTP | None = None
+        self.host: str | None = None
+        self.messages_sent = 0
+
 
 class EmailService(BaseService):
     """Service for sending email notifications.
@@ -38,12 +151,17 @@ class EmailService(BaseService):
         """
         super().__init__(config)
 
-        # Email configuration
+        # Email configuration; port 465 means implicit TLS (SMTPS) unless overridden
+        smtp_port = self.get_config("smtp_port", 587)
+        use_ssl = self.get_config("use_ssl", smtp_port == 465)
         self.email_config = EmailConfiguration(
             enabled=self.get_config("email_enabled", False),
             smtp_host=self.get_config("smtp_host", "smtp.gmail.com"),
-            smtp_port=self.get_config("smtp_port", 587),
-            use_tls=self.get_config("use_tls", True),
+            smtp_hosts=self.get_config("smtp_hosts", []),
+            host_cooldown=self.get_config("smtp_host_cooldown", 60),
+            smtp_port=smtp_port,
+            use_tls=self.get_config("use_tls", not use_ssl),
+            use_ssl=use_ssl,
             username=self.get_config("email_username"),
             password=self.get_config("email_password"),
             from_email=self.get_config("from_email", "noreply@resourceallocation.com"),
@@ -51,12 +169,33 @@ class EmailService(BaseService):
             default_recipients=self.get_config("default_recipients", []),
             max_retries=self.get_config("max_retries", 3),
             retry_delay=self.get_config("retry_delay", 60),
+            max_retry_delay=self.get_config("max_retry_delay", 1800),
             timeout=self.get_config("timeout", 30),
+            max_messages_per_connection=self.get_config("max_messages_per_connection", 1000),
+            enqueue_only=self.get_config("email_enqueue_only", False),
+            workers=self.get_config("email_workers", 2),
         )
 
-        self.smtp_connection = None
+        # Invariant From header for messages sent as the configured sender
+        self._from_header = f"{self.email_config.from_name} <{self.email_config.from_email}>"
+
+        # Pooled SMTP connection reused across sends; guarded by _smtp_lock
+        # since SMTP sessions are strictly sequential
+        self._session = _SmtpSession()
+        self._smtp_lock = threading.Lock()
+        # Relay rotation for new connections and per-relay cooldown deadlines
+        self._host_rotation = itertools.count()
+        self._host_cooldowns: dict[str, float] = {}
+        # Single background sender for send_email_async; created on first use
+        self.executor: ThreadPoolExecutor | None = None
+        # Enqueue-only mode: worker threads, each with its own SMTP session
+        self._work_queue: queue.Queue[tuple[EmailMessage, Future[bool]] | None] = queue.Queue()
+        self._workers: list[threading.Thread] = []
         self.templates: dict[str, EmailTemplate] = {}
-        self.queue: list[EmailMessage] = []
+        # Min-heap of (next_attempt_at, seq, message); seq keeps FIFO order on ties
+        self.queue: list[tuple[float, int, EmailMessage]] = []
+        self._queue_seq = itertools.count()
+        self._queue_lock = threading.Lock()
 
         # Load default templates
         self._load_default_templates()
@@ -76,6 +215,11 @@ class EmailService(BaseService):
 
         self._initialized = True
 
+    @property
+    def smtp_connection(self) -> smtplib.SMTP | None:
+        """Pooled SMTP connection shared by ``send_email`` and ``send_many``."""
+        return self._session.connection
+
     def validate(self) -> bool:
         """Validate the service configuration.
 
@@ -96,9 +240,18 @@ class EmailService(BaseService):
 
     def cleanup(self) -> None:
         """Clean up email service resources."""
-        if self.smtp_connection:
-            with suppress(Exception):
-                self.smtp_connection.quit()
+        for _ in self._workers:
+            self._work_queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+        with self._smtp_lock:
+            self._close_connection()
 
         super().cleanup()
 
@@ -178,33 +331,173 @@ Best regards,
 Resource Management System""",
         )
 
+        # Compile up front so the first notification doesn't pay for it
+        for template in self.templates.values():
+            template.compile()
+
     def _test_connection(self) -> bool:
         """Test SMTP connection.
 
+        A successful test leaves the connection pooled for the first send.
+
         Returns:
             True if connection successful.
         """
         try:
-            with smtplib.SMTP(
-                self.email_config.smtp_host,
-                self.email_config.smtp_port,
-                timeout=self.email_config.timeout,
-            ) as smtp:
-                if self.email_config.use_tls:
-                    smtp.starttls()
-
-                if self.email_config.username and self.email_config.password:
-                    smtp.login(self.email_config.username, self.email_config.password)
-
-                return True
+            with self._smtp_lock:
+                self._get_connection()
+            return True
         except Exception as e:
             logger.error(f"SMTP connection test failed: {e}")
             return False
 
+    def _connect(self, host: str) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection.
+
+        Args:
+            host: SMTP relay to connect to.
+
+        Returns:
+            Connected SMTP client.
+        """
+        import smtplib
+
+        # SMTP_SSL negotiates TLS during connect, saving the STARTTLS round-trip
+        smtp_class = smtplib.SMTP_SSL if self.email_config.use_ssl else smtplib.SMTP
+        smtp = smtp_class(
+            host,
+            self.email_config.smtp_port,
+            timeout=self.email_config.timeout,
+        )
+        try:
+            # Only negotiate what the server advertises: internal relays often
+            # offer neither STARTTLS nor AUTH
+            smtp.ehlo()
+            has_credentials = bool(self.email_config.username and self.email_config.password)
+            encrypted = self.email_config.use_ssl
+
+            if self.email_config.use_tls and not encrypted:
+                if smtp.has_extn("starttls"):
+                    smtp.starttls()
+                    smtp.ehlo()
+                    encrypted = True
+                elif has_credentials:
+                    raise smtplib.SMTPNotSupportedError(
+                        "Server does not offer STARTTLS; refusing to send credentials in clear"
+                    )
+                else:
+                    logger.debug("SMTP server does not offer STARTTLS, continuing without it")
+
+            if has_credentials:
+                if smtp.has_extn("auth"):
+                    smtp.login(self.email_config.username, self.email_config.password)
+                else:
+                    logger.debug("SMTP server does not offer AUTH, skipping login")
+        except Exception:
+            with suppress(Exception):
+                smtp.close()
+            raise
+
+        return smtp
+
+    def _get_connection(self, session: _SmtpSession | None = None) -> smtplib.SMTP:
+        """Get the session's SMTP connection, reconnecting if it is stale.
+
+        Callers must hold ``_smtp_lock`` when using the shared session.
+
+        Args:
+            session: SMTP session to use; defaults to the shared pooled session.
+
+        Returns:
+            Live SMTP client.
+        """
+        import smtplib
+
+        session = session or self._session
+        if session.connection is not None:
+            try:
+                if session.connection.noop()[0] == 250:
+                    return session.connection
+            except (smtplib.SMTPException, OSError):
+                pass
+            logger.debug("Pooled SMTP connection is no longer alive, reconnecting")
+            self._close_connection(session)
+
+        # New connections rotate across relays, falling through to the next on failure
+        last_error: Exception | None = None
+        for host in self._candidate_hosts():
+            try:
+                session.connection = self._connect(host)
+            except (smtplib.SMTPException, OSError) as e:
+                # Bad credentials or a refused handshake would fail on every
+                # relay; only unreachable relays fail over
+                if not _is_transport_error(e):
+                    raise
+                self._mark_host_down(host, e)
+                last_error = e
+                continue
+            session.host = host
+            session.messages_sent = 0
+            return session.connection
+
+        raise last_error
+
+    def _candidate_hosts(self) -> list[str]:
+        """Get relays to try for a new connection, in round-robin order.
+
+        Relays cooling down after a failure go last so they are only retried
+        when every other relay has failed too.
+
+        Returns:
+            Relay host names.
+        """
+        hosts = self.email_config.smtp_hosts or [self.email_config.smtp_host]
+        start = next(self._host_rotation) % len(hosts)
+        ordered = hosts[start:] + hosts[:start]
+
+        now = time.monotonic()
+        healthy = [host for host in ordered if self._host_cooldowns.get(host, 0.0) <= now]
+        return healthy + [host for host in ordered if host not in healthy]
+
+    def _mark_host_down(self, host: str | None, error: Exception) -> None:
+        """Put a relay into cooldown after a connection failure.
+
+        Args:
+            host: Relay that failed.
+            error: Error raised by the relay.
+        """
+        if host is None:
+            return
+        self._host_cooldowns[host] = time.monotonic() + self.email_config.host_cooldown
+        logger.warning(
+            f"SMTP relay {host} failed ({error}); "
+            f"skipping it for {self.email_config.host_cooldown}s"
+        )
+
+    def _close_connection(self, session: _SmtpSession | None = None) -> None:
+        """Close the session's SMTP connection, if any.
+
+        Callers must hold ``_smtp_lock`` when using the shared session.
+
+        Args:
+            session: SMTP session to close; defaults to the shared pooled session.
+        """
+        session = session or self._session
+        if session.connection is None:
+            return
+
+        with suppress(Exception):
+            session.connection.quit()
+        with suppress(Exception):
+            session.connection.close()
+        session.connection = None
+        session.host = None
+        session.messages_sent = 0
+
     @timer
     @error_handler
     def send_email(self, message: EmailMessage) -> bool:
-        """Send an email message.
+        """Send an email message over the pooled SMTP connection.
 
         Args:
             message: Email message to send.
@@ -217,46 +510,209 @@ Resource Management System""",
             return False
 
         try:
-            # Create MIME message
-            mime_msg = self._create_mime_message(message)
+            with self._smtp_lock:
+                self._get_connection()
+                self._deliver(message)
 
-            # Send email
-            with smtplib.SMTP(
-                self.email_config.smtp_host,
-                self.email_config.smtp_port,
-                timeout=self.email_config.timeout,
-            ) as smtp:
-                if self.email_config.use_tls:
-                    smtp.starttls()
+            message.mark_as_sent()
+            logger.info(f"Email sent successfully: {message.subject}")
+            return True
 
-                if self.email_config.username and self.email_config.password:
-                    smtp.login(self.email_config.username, self.email_config.password)
+        except Exception as e:
+            self._handle_send_failure(message, e)
+            return False
 
-                # Send message
-                recipient_addresses = [recipient.email for recipient in message.recipients]
-                smtp.send_message(
-                    mime_msg,
-                    from_addr=message.sender,
-                    to_addrs=recipient_addresses,
-                )
+    def send_email_async(self, message: EmailMessage) -> Future[bool]:
+        """Send an email on a background thread without blocking the caller.
 
-                message.mark_as_sent()
-                logger.info(f"Email sent successfully: {message.subject}")
-                return True
+        By default sends run one at a time on a single worker, sharing the
+        pooled connection with ``send_email``. In enqueue-only mode the message
+        is handed to the worker pool instead.
 
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"Failed to send email: {error_msg}")
-            message.mark_as_failed(error_msg)
-
-            # Retry if allowed
-            if message.can_retry():
-                self.queue_email(message)
-                logger.info(
-                    f"Email queued for retry (attempt {message.retry_count}/{message.max_retries})"
-                )
+        Args:
+            message: Email message to send.
 
-            return False
+        Returns:
+            Future resolving to True if the message was sent.
+        """
+        if self.email_config.enqueue_only:
+            return self.enqueue_email(message)
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-sender")
+        return self.executor.submit(self.send_email, message)
+
+    def enqueue_email(self, message: EmailMessage) -> Future[bool]:
+        """Hand a message to the background worker pool and return immediately.
+
+        Workers are started on first use; each keeps its own SMTP connection.
+        Failed messages go onto the retry queue like any other send.
+
+        Args:
+            message: Email message to send.
+
+        Returns:
+            Future resolving to True if the message was sent.
+        """
+        if not self._workers:
+            self._start_workers()
+
+        future: Future[bool] = Future()
+        message.status = EmailStatus.QUEUED
+        self._work_queue.put((message, future))
+        return future
+
+    def _start_workers(self) -> None:
+        """Start the enqueue-only worker threads."""
+        for index in range(max(self.email_config.workers, 1)):
+            worker = threading.Thread(
+                target=self._worker_loop, name=f"email-worker-{index}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_loop(self) -> None:
+        """Send messages from the work queue over this worker's own connection."""
+        session = _SmtpSession()
+        try:
+            while True:
+                item = self._work_queue.get()
+                if item is None:
+                    break
+
+                message, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                if not self.email_config.enabled:
+                    logger.warning("Email service is disabled")
+                    future.set_result(False)
+                    continue
+
+                try:
+                    self._get_connection(session)
+                    self._deliver(message, session)
+                except Exception as e:
+                    self._handle_send_failure(message, e)
+                    future.set_result(False)
+                else:
+                    message.mark_as_sent()
+                    logger.info(f"Email sent successfully: {message.subject}")
+                    future.set_result(True)
+        finally:
+            self._close_connection(session)
+
+    @timer
+    def send_many(self, messages: list[EmailMessage]) -> tuple[int, int]:
+        """Send a batch of messages back-to-back over one pooled connection.
+
+        The connection is checked once for the whole batch and messages are
+        sent without pausing between them; failed messages are re-queued with
+        a retry delay if they have retries left.
+
+        Args:
+            messages: Email messages to send.
+
+        Returns:
+            Tuple of (sent_count, failed_count).
+        """
+        if not self.email_config.enabled:
+            logger.warning("Email service is disabled")
+            return 0, len(messages)
+
+        sent = 0
+        failed = 0
+
+        with self._smtp_lock:
+            try:
+                self._get_connection()
+            except Exception as e:
+                for message in messages:
+                    self._handle_send_failure(message, e)
+                return 0, len(messages)
+
+            for message in messages:
+                try:
+                    self._deliver(message)
+                except Exception as e:
+                    self._handle_send_failure(message, e)
+                    failed += 1
+                else:
+                    message.mark_as_sent()
+                    sent += 1
+
+        logger.info(f"Batch sent: {sent} sent, {failed} failed")
+        return sent, failed
+
+    def _deliver(self, message: EmailMessage, session: _SmtpSession | None = None) -> None:
+        """Send one message over an SMTP session.
+
+        Callers must hold ``_smtp_lock`` when using the shared session.
+
+        Args:
+            message: Email message to send.
+            session: SMTP session to use; defaults to the shared pooled session.
+        """
+        import smtplib
+
+        session = session or self._session
+        mime_bytes = self._get_mime_bytes(message)
+        recipient_addresses = [recipient.email for recipient in message.recipients]
+
+        smtp = session.connection
+        if smtp is None:
+            smtp = self._get_connection(session)
+
+        try:
+            smtp.sendmail(message.sender, recipient_addresses, mime_bytes)
+        except (smtplib.SMTPException, OSError) as e:
+            # Drop a broken connection so the next send reconnects elsewhere;
+            # per-message rejections leave the relay and connection in use
+            if _is_transport_error(e):
+                self._mark_host_down(session.host, e)
+                self._close_connection(session)
+            raise
+        session.messages_sent += 1
+
+        # Providers cap messages per connection; recycle before hitting it
+        if session.messages_sent >= self.email_config.max_messages_per_connection:
+            logger.debug(f"Recycling SMTP connection after {session.messages_sent} messages")
+            self._close_connection(session)
+
+    def _handle_send_failure(self, message: EmailMessage, error: Exception) -> None:
+        """Mark a message as failed and re-queue it if retries remain.
+
+        Args:
+            message: Email message that failed.
+            error: Exception raised while sending.
+        """
+        error_msg = str(error)
+        logger.error(f"Failed to send email: {error_msg}")
+        message.mark_as_failed(error_msg)
+
+        # Retry if allowed
+        if message.can_retry():
+            self.queue_email(message)
+            logger.info(
+                f"Email queued for retry (attempt {message.retry_count}/{message.max_retries})"
+            )
+
+    def _get_mime_bytes(self, message: EmailMessage) -> bytes:
+        """Get the message's wire-format MIME bytes, building them once.
+
+        Retries reuse the bytes cached on the message instead of re-assembling
+        the MIME tree and re-encoding attachments.
+
+        Args:
+            message: Email message.
+
+        Returns:
+            MIME message serialized with CRLF line endings.
+        """
+        if message._cached_mime is None:
+            mime_msg = self._create_mime_message(message)
+            message._cached_mime = mime_msg.as_bytes(policy=mime_msg.policy.clone(linesep="\r\n"))
+        return message._cached_mime
 
     def _create_mime_message(self, message: EmailMessage) -> MIMEMultipart:
         """Create MIME message from EmailMessage.
@@ -267,14 +723,19 @@ Resource Management System""",
         Returns:
             MIME message.
         """
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
         # Create multipart message
         mime_msg = MIMEMultipart("alternative")
 
         # Set headers
         mime_msg["Subject"] = message.subject
-        mime_msg[
-            "From"
-        ] = f"{message.sender_name or self.email_config.from_name} <{message.sender}>"
+        if message.sender == self.email_config.from_email and not message.sender_name:
+            mime_msg["From"] = self._from_header
+        else:
+            sender_name = message.sender_name or self.email_config.from_name
+            mime_msg["From"] = f"{sender_name} <{message.sender}>"
 
         # Add recipients
         to_recipients = message.get_recipients_by_type("to")
@@ -289,9 +750,9 @@ Resource Management System""",
             mime_msg[key] = value
 
         # Add priority header
-        if message.priority == EmailPriority.HIGH or message.priority == EmailPriority.URGENT:
-            mime_msg["X-Priority"] = "1"
-            mime_msg["Importance"] = "high"
+        if message.priority in _HIGH_PRIORITIES:
+            for key, value in _HIGH_PRIORITY_HEADERS:
+                mime_msg[key] = value
 
         # Add body
         text_part = MIMEText(message.body, "plain")
@@ -314,14 +775,21 @@ Resource Management System""",
             mime_msg: MIME message.
             attachment: Attachment to add.
         """
-        try:
-            # Load content
-            content = attachment.load_content()
+        from email.mime.base import MIMEBase
 
+        try:
             # Create MIME attachment
             part = MIMEBase("application", "octet-stream")
-            part.set_payload(content)
-            encoders.encode_base64(part)
+
+            if attachment.content is None and attachment.file_path:
+                # File-backed: reuse the cached encoding while the file is unchanged
+                stat = attachment.file_path.stat()
+                part.set_payload(
+                    _encoded_attachment(str(attachment.file_path), stat.st_mtime_ns, stat.st_size)
+                )
+            else:
+                part.set_payload(_encode_base64(attachment.load_content()))
+            part["Content-Transfer-Encoding"] = "base64"
 
             part.add_header("Content-Disposition", f"attachment; filename={attachment.filename}")
 
@@ -333,15 +801,30 @@ Resource Management System""",
     def queue_email(self, message: EmailMessage):
         """Queue email for sending.
 
+        Fresh messages are due immediately. Retries back off exponentially,
+        ``retry_delay * 2 ** (retry_count - 1)`` seconds capped at ``max_retry_delay``.
+
         Args:
             message: Email message to queue.
         """
         message.status = EmailStatus.QUEUED
-        self.queue.append(message)
+        delay = 0
+        if message.retry_count:
+            delay = min(
+                self.email_config.retry_delay * 2 ** (message.retry_count - 1),
+                self.email_config.max_retry_delay,
+            )
+        message.next_attempt_at = time.monotonic() + delay
+        with self._queue_lock:
+            heapq.heappush(self.queue, (message.next_attempt_at, next(self._queue_seq), message))
         logger.info(f"Email queued: {message.subject}")
 
     def process_queue(self) -> tuple[int, int]:
-        """Process email queue.
+        """Process email queue until it is empty.
+
+        All due messages are sent as one batch; the loop only sleeps when the
+        earliest remaining message is not yet due, waking at least once a second
+        to pick up retries queued meanwhile by background senders.
 
         Returns:
             Tuple of (sent_count, failed_count).
@@ -349,18 +832,23 @@ Resource Management System""",
         sent = 0
         failed = 0
 
-        # Process queue
         while self.queue:
-            message = self.queue.pop(0)
-
-            # Check if retry delay has passed
-            if message.retry_count > 0:
-                time.sleep(self.email_config.retry_delay)
-
-            if self.send_email(message):
-                sent += 1
-            else:
-                failed += 1
+            with self._queue_lock:
+                next_attempt_at = self.queue[0][0]
+            delay = next_attempt_at - time.monotonic()
+            if delay > 0:
+                time.sleep(min(delay, 1.0))
+                continue
+
+            cutoff = time.monotonic()
+            batch = []
+            with self._queue_lock:
+                while self.queue and self.queue[0][0] <= cutoff:
+                    batch.append(heapq.heappop(self.queue)[2])
+
+            batch_sent, batch_failed = self.send_many(batch)
+            sent += batch_sent
+            failed += batch_failed
 
         logger.info(f"Queue processed: {sent} sent, {failed} failed")
         return sent, failed
@@ -379,7 +867,7 @@ Resource Management System""",
             attach_report: Whether to attach detailed report.
 
         Returns:
-            True if sent successfully.
+            True if sent successfully (or queued, in enqueue-only mode).
         """
         try:
             # Get template
@@ -402,22 +890,30 @@ Resource Management System""",
                 "sender_name": self.email_config.from_name,
             }
 
+            # Recipients, dropping duplicates so nobody gets two copies
+            to_list = list(dict.fromkeys(recipients or self.email_config.default_recipients))
+            to_set = set(to_list)
+
             # Render template
-            message = template.render(variables)
+            message = template.render(
+                variables, recipients=[EmailRecipient(email=email) for email in to_list]
+            )
 
-            # Add recipients
-            recipient_list = recipients or self.email_config.default_recipients
-            for email in recipient_list:
-                message.add_recipient(email)
+            # Add CC recipients not already addressed directly
+            message.add_recipients(
+                dict.fromkeys(e for e in self.email_config.cc_recipients if e not in to_set),
+                recipient_type="cc",
+            )
 
-            # Add CC recipients
-            for email in self.email_config.cc_recipients:
-                message.add_recipient(email, recipient_type="cc")
+            # Hand off to the workers in enqueue-only mode
+            if self.email_config.enqueue_only:
+                self.enqueue_email(message)
+                return True
 
             # Send email
             return self.send_email(message)
 
-        except Exception as e:
+        except (ValueError, OSError) as e:
             logger.error(f"Failed to send allocation notification: {e}")
             return False
 
@@ -435,7 +931,7 @@ Resource Management System""",
             recipients: Email recipients.
 
         Returns:
-            True if sent successfully.
+            True if sent successfully (or queued, in enqueue-only mode).
         """
         try:
             message = EmailMessage(
@@ -453,18 +949,22 @@ Best regards,
 Resource Management System""",
                 sender=self.email_config.from_email,
                 sender_name=self.email_config.from_name,
-                recipients=[],
+                # Recipients, dropping duplicates
+                recipients=[
+                    EmailRecipient(email=email)
+                    for email in dict.fromkeys(recipients or self.email_config.default_recipients)
+                ],
                 priority=EmailPriority.HIGH,
             )
 
-            # Add recipients
-            recipient_list = recipients or self.email_config.default_recipients
-            for email in recipient_list:
-                message.add_recipient(email)
+            # Hand off to the workers in enqueue-only mode
+            if self.email_config.enqueue_only:
+                self.enqueue_email(message)
+                return True
 
             return self.send_email(message)
 
-        except Exception as e:
+        except (ValueError, OSError) as e:
             logger.error(f"Failed to send error notification: {e}")
             return False
 
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
-from contextlib import suppress
-from pathlib import Path
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from copy import copy
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
 from typing import Any
 
 import pandas as pd
@@ -18,13 +24,49 @@ except ImportError:
     xw = None  # Define xw as None when not available
     logger.warning("xlwings not available - Excel integration will be limited")
 
+try:
+    import xlsxwriter
+
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+    xlsxwriter = None
+
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 
 from src.core.base_service import BaseService, error_handler, timer
 from src.models.allocation import AllocationResult
 from src.models.excel import ExcelRange, ExcelStyle
 
+# Excel XlHAlign / XlVAlign constants used by the xlwings styling path
+_HORIZONTAL_ALIGN = MappingProxyType(
+    {
+        "left": -4131,
+        "center": -4108,
+        "right": -4152,
+        "justify": -4130,
+        "fill": 5,
+        "distributed": -4117,
+    }
+)
+_VERTICAL_ALIGN = MappingProxyType(
+    {
+        "top": -4160,
+        "center": -4108,
+        "bottom": -4107,
+        "justify": -4130,
+        "distributed": -4117,
+    }
+)
+
+
+@lru_cache(maxsize=64)
+def _rgb_to_bgr(rgb: str) -> int:
+    """Convert an ``RRGGBB`` hex string to the BGR integer Excel's COM API expects."""
+    return int(rgb[4:6] + rgb[2:4] + rgb[0:2], 16)
+
 
 class ExcelService(BaseService):
     """Service for Excel workbook operations.
@@ -43,10 +85,20 @@ class ExcelService(BaseService):
         super().__init__(config)
         self.app = None
         self.workbook = None
+        # Worksheet objects by name for the open workbook; reset whenever it changes
+        self._sheet_cache: dict[str, Any] = {}
+        # Single background thread for non-blocking openpyxl saves (created lazily)
+        self._save_executor: ThreadPoolExecutor | None = None
+        # File the workbook is saved to by flush() while a session is open
+        self._session_path: str | None = None
         self.use_xlwings = self.get_config("use_xlwings", XLWINGS_AVAILABLE)
         self.excel_visible = self.get_config("excel_visible", False)
         self.display_alerts = self.get_config("display_alerts", False)
         self.template_path = self.get_config("template_path", None)
+        # Stream openpyxl exports through write-only workbooks (append-only, low memory)
+        self.bulk_export = self.get_config("bulk_export", False)
+        # Engine for allocation exports: "openpyxl" or "xlsxwriter"
+        self.export_engine = self.get_config("export_engine", "openpyxl")
 
     def initialize(self) -> None:
         """Initialize the Excel service."""
@@ -69,16 +121,19 @@ class ExcelService(BaseService):
         Returns:
             True if configuration is valid.
         """
-        if self.template_path:
-            template = Path(self.template_path)
-            if not template.exists():
-                logger.error(f"Template file not found: {self.template_path}")
-                return False
+        if self.template_path and not os.path.isfile(self.template_path):
+            logger.error(f"Template file not found: {self.template_path}")
+            return False
 
         return True
 
     def cleanup(self) -> None:
         """Clean up Excel resources."""
+        if self._save_executor:
+            # Let pending background saves finish before tearing down
+            self._save_executor.shutdown(wait=True)
+            self._save_executor = None
+
         if self.workbook and self.use_xlwings:
             with suppress(Exception):
                 self.workbook.close()
@@ -87,31 +142,44 @@ class ExcelService(BaseService):
             with suppress(Exception):
                 self.app.quit()
 
+        self._sheet_cache.clear()
         super().cleanup()
 
     @timer
     @error_handler
-    def create_workbook(self, template: str | None = None) -> Workbook | Any:
+    def create_workbook(
+        self, template: str | None = None, bulk_export: bool | None = None
+    ) -> Workbook | Any:
         """Create a new workbook.
 
         Args:
             template: Path to template file.
+            bulk_export: Create an openpyxl write-only workbook when no template is
+                used. Sheets can then only be appended to, not read or styled.
+                Defaults to the ``bulk_export`` config setting.
 
         Returns:
             Workbook object (xlwings Book or openpyxl Workbook).
         """
+        if bulk_export is None:
+            bulk_export = self.bulk_export
+
+        self._sheet_cache.clear()
+
         if self.use_xlwings:
-            if template and Path(template).exists():
+            if template and os.path.isfile(template):
                 self.workbook = self.app.books.open(template)
             else:
                 self.workbook = self.app.books.add()
             logger.info("Created xlwings workbook")
         else:
-            if template and Path(template).exists():
+            if template and os.path.isfile(template):
                 self.workbook = load_workbook(template)
+            elif bulk_export:
+                self.workbook = Workbook(write_only=True)
             else:
                 self.workbook = Workbook()
-            logger.info("Created openpyxl workbook")
+            logger.info(f"Created openpyxl workbook{' (write-only)' if bulk_export else ''}")
 
         return self.workbook
 
@@ -126,25 +194,35 @@ class ExcelService(BaseService):
         Returns:
             Workbook object.
         """
-        file_path = Path(file_path)
-        if not file_path.exists():
+        file_path = str(file_path)
+        if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        self._sheet_cache.clear()
         if self.use_xlwings:
-            self.workbook = self.app.books.open(str(file_path))
+            self.workbook = self.app.books.open(file_path)
         else:
-            self.workbook = load_workbook(str(file_path))
+            self.workbook = load_workbook(file_path)
 
         logger.info(f"Opened workbook: {file_path}")
         return self.workbook
 
     @timer
     @error_handler
-    def save_workbook(self, file_path: str | None = None) -> None:
+    def save_workbook(
+        self, file_path: str | None = None, blocking: bool = True
+    ) -> Future[None] | None:
         """Save the workbook.
 
         Args:
             file_path: Path to save the file. If None, saves to current location.
+            blocking: When False, openpyxl workbooks are serialized on a background
+                thread and a Future is returned. The workbook must not be modified
+                until it resolves; the service may move on to a new workbook.
+
+        Returns:
+            Future for the background save when ``blocking`` is False on the
+            openpyxl path, otherwise None.
         """
         if not self.workbook:
             raise ValueError("No workbook is open")
@@ -155,12 +233,68 @@ class ExcelService(BaseService):
             else:
                 self.workbook.save()
         else:
-            if file_path:
-                self.workbook.save(file_path)
-            else:
+            if not file_path:
                 raise ValueError("File path required for openpyxl save")
+            if not blocking:
+                if self._save_executor is None:
+                    self._save_executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="excel-save"
+                    )
+                return self._save_executor.submit(self._save_openpyxl, self.workbook, file_path)
+            self.workbook.save(file_path)
 
         logger.info(f"Saved workbook: {file_path or 'current location'}")
+        return None
+
+    @staticmethod
+    def _save_openpyxl(workbook: Workbook, file_path: str) -> None:
+        """Save an openpyxl workbook; runs on the background save thread."""
+        try:
+            workbook.save(file_path)
+        except Exception as e:
+            logger.error(f"Background save of {file_path} failed: {e}")
+            raise
+        logger.info(f"Saved workbook: {file_path}")
+
+    def flush(self) -> None:
+        """Save the session workbook to its file without closing it."""
+        if not self._session_path:
+            raise ValueError("No workbook session is open")
+        self.save_workbook(self._session_path)
+
+    @contextmanager
+    def session(self, file_path: str) -> Iterator[ExcelService]:
+        """Keep one workbook open across a batch of operations.
+
+        Opens ``file_path`` (or creates a new workbook if it does not exist),
+        yields the service, then saves and closes the workbook. The xlwings app
+        is reused across sessions. Nothing is saved if the block raises.
+
+        Usage:
+            with excel_service.session("report.xlsx") as excel:
+                excel.write_allocation_result("Allocations", result)
+                excel.flush()
+                ...
+
+        Args:
+            file_path: Workbook file to open and save to.
+        """
+        if os.path.isfile(file_path):
+            self.open_workbook(file_path)
+        else:
+            self.create_workbook(bulk_export=False)
+        self._session_path = file_path
+
+        try:
+            yield self
+            self.flush()
+        finally:
+            self._session_path = None
+            if self.use_xlwings and self.workbook:
+                with suppress(Exception):
+                    self.workbook.close()
+            self.workbook = None
+            self._sheet_cache.clear()
 
     def get_sheet(self, sheet_name: str) -> Any:
         """Get a worksheet by name.
@@ -174,10 +308,15 @@ class ExcelService(BaseService):
         if not self.workbook:
             raise ValueError("No workbook is open")
 
-        if self.use_xlwings:
-            return self.workbook.sheets[sheet_name]
-        else:
-            return self.workbook[sheet_name]
+        sheet = self._sheet_cache.get(sheet_name)
+        if sheet is None:
+            if self.use_xlwings:
+                sheet = self.workbook.sheets[sheet_name]
+            else:
+                sheet = self.workbook[sheet_name]
+            self._sheet_cache[sheet_name] = sheet
+
+        return sheet
 
     def get_sheet_names(self) -> list[str]:
         """Get list of all sheet names in the workbook.
@@ -214,6 +353,7 @@ class ExcelService(BaseService):
         else:
             sheet = self.workbook.create_sheet(sheet_name, position)
 
+        self._sheet_cache[sheet_name] = sheet
         logger.info(f"Created sheet: {sheet_name}")
         return sheet
 
@@ -255,38 +395,93 @@ class ExcelService(BaseService):
         if self.use_xlwings:
             sheet.range((start_row, start_col)).value = df if headers else df.values
         else:
-            # Write headers
+            rows = self._dataframe_rows(df)
             if headers:
-                for col_idx, col_name in enumerate(df.columns, start=start_col):
-                    sheet.cell(row=start_row, column=col_idx, value=str(col_name))
-                start_row += 1
+                rows = chain([tuple(str(col_name) for col_name in df.columns)], rows)
+            self._write_rows(sheet, rows, start_row, start_col)
 
-            # Write data
-            for row_idx, row_data in enumerate(df.values, start=start_row):
-                for col_idx, value in enumerate(row_data, start=start_col):
-                    sheet.cell(row=row_idx, column=col_idx, value=value)
+    @staticmethod
+    def _dataframe_rows(df: pd.DataFrame) -> Iterator[tuple]:
+        """Yield DataFrame rows as tuples of Python-native values.
+
+        Each column is converted once (NaN/NaT become None) rather than every
+        cell being boxed and type-checked individually.
+        """
+        columns = [
+            series.astype(object).where(series.notna(), None).tolist() for _, series in df.items()
+        ]
+        return zip(*columns, strict=True)
+
+    @staticmethod
+    def _write_rows(sheet: Any, rows: Iterable[Sequence], start_row: int, start_col: int) -> None:
+        """Write a block of rows to an openpyxl worksheet at (start_row, start_col)."""
+        if isinstance(sheet, WriteOnlyWorksheet):
+            ExcelService._stream_rows(sheet, rows, start_row, start_col)
+            return
+
+        # Worksheet.append builds cells in bulk but always writes below the
+        # last used row, so use it only when the block starts exactly there
+        if start_row == sheet._current_row + 1:
+            if start_col == 1:
+                for row in rows:
+                    sheet.append(row)
+            else:
+                for row in rows:
+                    sheet.append(dict(enumerate(row, start=start_col)))
+            return
+
+        for row_idx, row_data in enumerate(rows, start=start_row):
+            for col_idx, value in enumerate(row_data, start=start_col):
+                sheet.cell(row=row_idx, column=col_idx, value=value)
+
+    @staticmethod
+    def _stream_rows(
+        sheet: WriteOnlyWorksheet, rows: Iterable[Sequence], start_row: int, start_col: int
+    ) -> None:
+        """Append rows to a write-only worksheet, which only streams top to bottom.
+
+        Write-only sheets don't track their position, so the last written row
+        is kept in ``_current_row`` just like a regular worksheet.
+        """
+        if start_row <= sheet._current_row:
+            raise ValueError(
+                f"Write-only sheet {sheet.title} is already written up to row "
+                f"{sheet._current_row}; cannot write at row {start_row}"
+            )
+
+        for _ in range(start_row - sheet._current_row - 1):
+            sheet.append(())
+        sheet._current_row = start_row - 1
+
+        # None values are skipped by the writer, so padding creates no cells
+        padding = (None,) * (start_col - 1)
+        for row_data in rows:
+            sheet.append(padding + tuple(row_data))
+            sheet._current_row += 1
 
     def _write_list(self, sheet: Any, data: list, start_row: int, start_col: int) -> None:
         """Write list to worksheet."""
+        rows = [
+            row_data if isinstance(row_data, list | tuple) else (row_data,) for row_data in data
+        ]
         if self.use_xlwings:
-            sheet.range((start_row, start_col)).value = data
+            # One rectangular 2-D assignment is a single COM call
+            width = max((len(row_data) for row_data in rows), default=0)
+            sheet.range((start_row, start_col)).value = [
+                [*row_data, *([None] * (width - len(row_data)))] for row_data in rows
+            ]
         else:
-            for row_idx, row_data in enumerate(data, start=start_row):
-                if isinstance(row_data, list | tuple):
-                    for col_idx, value in enumerate(row_data, start=start_col):
-                        sheet.cell(row=row_idx, column=col_idx, value=value)
-                else:
-                    sheet.cell(row=row_idx, column=start_col, value=row_data)
+            self._write_rows(sheet, rows, start_row, start_col)
 
     def _write_dict(self, sheet: Any, data: dict, start_row: int, start_col: int) -> None:
         """Write dictionary to worksheet."""
-        for row_idx, (key, value) in enumerate(data.items(), start=start_row):
-            if self.use_xlwings:
-                sheet.range((row_idx, start_col)).value = key
-                sheet.range((row_idx, start_col + 1)).value = value
-            else:
-                sheet.cell(row=row_idx, column=start_col, value=key)
-                sheet.cell(row=row_idx, column=start_col + 1, value=value)
+        if self.use_xlwings:
+            # One 2-D assignment instead of two COM calls per entry
+            sheet.range((start_row, start_col)).value = [
+                [key, value] for key, value in data.items()
+            ]
+        else:
+            self._write_rows(sheet, data.items(), start_row, start_col)
 
     def read_data(
         self, sheet_name: str, range_str: str | None = None, as_dataframe: bool = True
@@ -305,27 +500,27 @@ class ExcelService(BaseService):
 
         if self.use_xlwings:
             data = sheet.range(range_str).value if range_str else sheet.used_range.value
-        else:
-            data = []
-            if range_str:
-                excel_range = ExcelRange.from_excel_range(sheet_name, range_str)
-                for row in sheet.iter_rows(
+        elif range_str:
+            excel_range = ExcelRange.from_excel_range(sheet_name, range_str)
+            data = list(
+                sheet.iter_rows(
                     min_row=excel_range.start_row,
                     max_row=excel_range.end_row,
                     min_col=excel_range.start_col,
                     max_col=excel_range.end_col,
                     values_only=True,
-                ):
-                    data.append(list(row))
-            else:
-                for row in sheet.values:
-                    if any(row):  # Skip empty rows
-                        data.append(list(row))
+                )
+            )
+        else:
+            # Rows with no truthy cell are skipped for both return types, so the
+            # first populated row is the header and dtypes come from real rows only
+            data = [row for row in sheet.iter_rows(values_only=True) if any(row)]
 
         if as_dataframe and data:
-            df = pd.DataFrame(data[1:], columns=data[0])
-            return df
+            return pd.DataFrame(data[1:], columns=data[0])
 
+        if not self.use_xlwings:
+            return [list(row) for row in data]
         return data
 
     def apply_style(self, excel_range: ExcelRange, style: ExcelStyle) -> None:
@@ -347,88 +542,97 @@ class ExcelService(BaseService):
     def _apply_style_xlwings(self, sheet: Any, excel_range: ExcelRange, style: ExcelStyle) -> None:
         """Apply style using xlwings."""
         range_obj = sheet.range(excel_range.to_excel_range())
+        # Set properties on the COM objects directly; each xlwings wrapper access
+        # is an extra round-trip into Excel
+        api = range_obj.api
 
         if style.font:
-            range_obj.font.name = style.font.name
-            range_obj.font.size = style.font.size
-            range_obj.font.bold = style.font.bold
-            range_obj.font.italic = style.font.italic
+            api_font = api.Font
+            api_font.Name = style.font.name
+            api_font.Size = style.font.size
+            api_font.Bold = style.font.bold
+            api_font.Italic = style.font.italic
 
             if style.font.color and style.font.color.rgb:
-                range_obj.font.color = tuple(
-                    int(style.font.color.rgb[i : i + 2], 16) for i in (0, 2, 4)
-                )
+                api_font.Color = _rgb_to_bgr(style.font.color.rgb)
 
         if style.alignment:
-            range_obj.api.HorizontalAlignment = self._get_xlwings_alignment(
-                style.alignment.horizontal
-            )
-            range_obj.api.VerticalAlignment = self._get_xlwings_alignment(
+            api.HorizontalAlignment = self._get_xlwings_alignment(style.alignment.horizontal)
+            api.VerticalAlignment = self._get_xlwings_alignment(
                 style.alignment.vertical, vertical=True
             )
-            range_obj.api.WrapText = style.alignment.wrap_text
+            api.WrapText = style.alignment.wrap_text
 
         if style.number_format:
-            range_obj.number_format = style.number_format
+            api.NumberFormat = style.number_format
 
     def _apply_style_openpyxl(self, sheet: Any, excel_range: ExcelRange, style: ExcelStyle) -> None:
         """Apply style using openpyxl."""
-        for row in range(excel_range.start_row, excel_range.end_row + 1):
-            for col in range(excel_range.start_col, excel_range.end_col + 1):
-                cell = sheet.cell(row=row, column=col)
-
-                if style.font:
-                    cell.font = Font(
-                        name=style.font.name,
-                        size=style.font.size,
-                        bold=style.font.bold,
-                        italic=style.font.italic,
-                        underline="single" if style.font.underline else None,
-                        strike=style.font.strike,
-                        color=style.font.color.rgb if style.font.color else None,
-                    )
+        # Build each style object once and share it across the range; openpyxl
+        # interns styles, so identical objects also skip repeated hash lookups
+        font = None
+        if style.font:
+            font = Font(
+                name=style.font.name,
+                size=style.font.size,
+                bold=style.font.bold,
+                italic=style.font.italic,
+                underline="single" if style.font.underline else None,
+                strike=style.font.strike,
+                color=style.font.color.rgb if style.font.color else None,
+            )
 
-                if style.alignment:
-                    cell.alignment = Alignment(
-                        horizontal=style.alignment.horizontal,
-                        vertical=style.alignment.vertical,
-                        text_rotation=style.alignment.text_rotation,
-                        wrap_text=style.alignment.wrap_text,
-                        shrink_to_fit=style.alignment.shrink_to_fit,
-                        indent=style.alignment.indent,
-                    )
+        alignment = None
+        if style.alignment:
+            alignment = Alignment(
+                horizontal=style.alignment.horizontal,
+                vertical=style.alignment.vertical,
+                text_rotation=style.alignment.text_rotation,
+                wrap_text=style.alignment.wrap_text,
+                shrink_to_fit=style.alignment.shrink_to_fit,
+                indent=style.alignment.indent,
+            )
 
-                if style.fill and style.fill.fg_color:
-                    cell.fill = PatternFill(
-                        start_color=style.fill.fg_color.rgb,
-                        end_color=style.fill.bg_color.rgb if style.fill.bg_color else None,
-                        fill_type=style.fill.pattern_type,
-                    )
+        fill = None
+        if style.fill and style.fill.fg_color:
+            fill = PatternFill(
+                start_color=style.fill.fg_color.rgb,
+                end_color=style.fill.bg_color.rgb if style.fill.bg_color else None,
+                fill_type=style.fill.pattern_type,
+            )
+
+        number_format = style.number_format
+
+        # Cells that start out with the same style end up with the same style, so
+        # the attribute assignments run once per distinct starting style and the
+        # rest of the range copies the resulting style array
+        styled: dict[tuple[int, ...], Any] = {}
+        for row in sheet[excel_range.to_excel_range()]:
+            for cell in row:
+                key = tuple(cell._style or ())
+                if key in styled:
+                    cell._style = copy(styled[key])
+                    continue
+
+                if font:
+                    cell.font = font
+
+                if alignment:
+                    cell.alignment = alignment
 
-                if style.number_format:
-                    cell.number_format = style.number_format
+                if fill:
+                    cell.fill = fill
+
+                if number_format:
+                    cell.number_format = number_format
+
+                styled[key] = copy(cell._style)
 
     def _get_xlwings_alignment(self, alignment: str, vertical: bool = False) -> int:
         """Get xlwings alignment constant."""
         if vertical:
-            mapping = {
-                "top": -4160,
-                "center": -4108,
-                "bottom": -4107,
-                "justify": -4130,
-                "distributed": -4117,
-            }
-        else:
-            mapping = {
-                "left": -4131,
-                "center": -4108,
-                "right": -4152,
-                "justify": -4130,
-                "fill": 5,
-                "distributed": -4117,
-            }
-
-        return mapping.get(alignment, -4131 if not vertical else -4107)
+            return _VERTICAL_ALIGN.get(alignment, -4107)
+        return _HORIZONTAL_ALIGN.get(alignment, -4131)
 
     def write_allocation_result(
         self, sheet_name: str, result: AllocationResult, start_row: int = 1
@@ -440,32 +644,116 @@ class ExcelService(BaseService):
             result: Allocation result to write.
             start_row: Starting row for the data.
         """
-        # Prepare allocation data
-        allocation_data = []
-        for driver_id, vehicles in result.allocations.items():
-            for vehicle_id in vehicles:
-                allocation_data.append(
-                    {
-                        "Driver ID": driver_id,
-                        "Vehicle ID": vehicle_id,
-                        "Status": "Allocated",
-                        "Timestamp": result.timestamp,
-                    }
+        sheet = self.get_sheet(sheet_name)
+        rows = self._allocation_rows(result)
+        header = next(rows)
+        first = next(rows, None)
+
+        # An empty result leaves the sheet untouched, header included
+        if first is not None:
+            if self.use_xlwings:
+                # xlwings writes a DataFrame with its index column; keep that layout
+                sheet.range((start_row, 1)).value = pd.DataFrame.from_records(
+                    chain([first], rows), columns=header
                 )
+            else:
+                self._write_rows(sheet, chain([header, first], rows), start_row, 1)
 
-        # Add unallocated vehicles
-        for vehicle_id in result.unallocated_vehicles:
-            allocation_data.append(
-                {
-                    "Driver ID": "Unallocated",
-                    "Vehicle ID": vehicle_id,
-                    "Status": "Unallocated",
-                    "Timestamp": result.timestamp,
-                }
-            )
+        logger.info(f"Wrote allocation result to {sheet_name}")
 
-        # Convert to DataFrame and write
-        df = pd.DataFrame(allocation_data)
-        self.write_data(sheet_name, df, start_row=start_row)
+    @staticmethod
+    def _allocation_rows(result: AllocationResult) -> Iterator[tuple]:
+        """Yield the header and one row per allocated/unallocated vehicle."""
+        timestamp = result.timestamp
+
+        # Rows are generated straight from the result; no intermediate dicts/DataFrame
+        return chain(
+            [("Driver ID", "Vehicle ID", "Status", "Timestamp")],
+            (
+                (driver_id, vehicle_id, "Allocated", timestamp)
+                for driver_id, vehicles in result.allocations.items()
+                for vehicle_id in vehicles
+            ),
+            (
+                ("Unallocated", vehicle_id, "Unallocated", timestamp)
+                for vehicle_id in result.unallocated_vehicles
+            ),
+        )
+
+    def export_allocation_result(
+        self, file_path: str, result: AllocationResult, sheet_name: str = "Allocations"
+    ) -> None:
+        """Export an allocation result to a new workbook file.
 
-        logger.info(f"Wrote allocation result to {sheet_name}")
+        Args:
+            file_path: Path to save the workbook to.
+            result: Allocation result to write.
+            sheet_name: Name of the worksheet.
+        """
+        self.export_allocation_results(file_path, [(sheet_name, result)])
+
+    def export_allocation_results(
+        self, file_path: str, results: Iterable[tuple[str, AllocationResult]]
+    ) -> None:
+        """Export several allocation results to one new workbook file.
+
+        Each result gets its own worksheet and the workbook is saved once, so
+        the save/compression cost is paid once per file rather than per report.
+
+        Never drives Excel over COM, even when xlwings is enabled: the export is
+        non-interactive. With the ``export_engine`` config set to "xlsxwriter"
+        (and xlsxwriter installed) rows are streamed by xlsxwriter in
+        constant-memory mode; otherwise an openpyxl write-only workbook is used.
+        The service's current workbook is left as it was.
+
+        Args:
+            file_path: Path to save the workbook to.
+            results: (sheet name, allocation result) pairs, one sheet each.
+        """
+        if self.export_engine == "xlsxwriter":
+            if XLSXWRITER_AVAILABLE:
+                self._export_allocation_results_xlsxwriter(file_path, results)
+                return
+            logger.warning("xlsxwriter not available - exporting with openpyxl")
+
+        previous = (self.use_xlwings, self.workbook, self._sheet_cache)
+        if self.use_xlwings:
+            logger.info("Exporting allocation results with openpyxl instead of xlwings")
+
+        self.use_xlwings = False
+        self._sheet_cache = {}
+        try:
+            self.create_workbook(bulk_export=True)
+            for sheet_name, result in results:
+                self.create_sheet(sheet_name)
+                self.write_allocation_result(sheet_name, result)
+            self.save_workbook(file_path)
+        finally:
+            self.use_xlwings, self.workbook, self._sheet_cache = previous
+
+    def _export_allocation_results_xlsxwriter(
+        self, file_path: str, results: Iterable[tuple[str, AllocationResult]]
+    ) -> None:
+        """Stream allocation results to a file with xlsxwriter."""
+        workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True})
+        try:
+            # Same display format openpyxl gives datetimes by default
+            date_format = workbook.add_format({"num_format": "yyyy-mm-dd h:mm:ss"})
+
+            for sheet_name, result in results:
+                worksheet = workbook.add_worksheet(sheet_name)
+                rows = self._allocation_rows(result)
+                header = next(rows)
+                first = next(rows, None)
+                # Match write_allocation_result: an empty result gets an empty sheet
+                if first is None:
+                    continue
+                worksheet.write_row(0, 0, header)
+                rows = chain([first], rows)
+                for row_idx, (driver_id, vehicle_id, status, timestamp) in enumerate(rows, start=1):
+                    worksheet.write_row(row_idx, 0, (driver_id, vehicle_id, status))
+                    worksheet.write_datetime(row_idx, 3, timestamp, date_format)
+        finally:
+            workbook.close()
+
+        logger.info(f"Exported allocation results to {file_path} with xlsxwriter")
@@ -1,18 +1,55 @@
 """Form service for Excel-based data entry."""
 
+from collections.abc import Sequence
 from datetime import datetime
+from types import MappingProxyType
 from typing import Any
 
 import pandas as pd
 from loguru import logger
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill, Protection
+from openpyxl.utils import coordinate_to_tuple
 from openpyxl.worksheet.datavalidation import DataValidation
 
 from src.core.base_service import BaseService, error_handler, timer
 from src.models.excel import ExcelValidation
 from src.services.excel_service import ExcelService
 
+try:
+    import xlsxwriter
+
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+    xlsxwriter = None
+
+# openpyxl/Excel data validation names -> xlsxwriter's equivalents
+_XLSXWRITER_VALIDATE = MappingProxyType(
+    {
+        "whole": "integer",
+        "decimal": "decimal",
+        "list": "list",
+        "date": "date",
+        "time": "time",
+        "textLength": "length",
+        "custom": "custom",
+    }
+)
+_XLSXWRITER_CRITERIA = MappingProxyType(
+    {
+        "between": "between",
+        "notBetween": "not between",
+        "equal": "equal to",
+        "notEqual": "not equal to",
+        "greaterThan": "greater than",
+        "lessThan": "less than",
+        "greaterThanOrEqual": "greater than or equal to",
+        "lessThanOrEqual": "less than or equal to",
+    }
+)
+_FORM_PASSWORD = "resource_allocation"
+
 
 class FormField:
     """Represents a form field in Excel."""
@@ -66,6 +103,7 @@ class ExcelForm:
         self.title = title
         self.description = description
         self.fields: list[FormField] = []
+        self._fields_by_name: dict[str, FormField] = {}
         self.layout = "vertical"  # vertical or horizontal
         self.protected = True
         self.submission_handler = None
@@ -77,6 +115,8 @@ class ExcelForm:
             field: Form field to add.
         """
         self.fields.append(field)
+        # get_field has always returned the first field with a given name
+        self._fields_by_name.setdefault(field.name, field)
 
     def get_field(self, name: str) -> FormField | None:
         """Get field by name.
@@ -87,10 +127,7 @@ class ExcelForm:
         Returns:
             Form field or None.
         """
-        for field in self.fields:
-            if field.name == name:
-                return field
-        return None
+        return self._fields_by_name.get(name)
 
 
 class FormService(BaseService):
@@ -116,6 +153,8 @@ class FormService(BaseService):
         self.form_template_path = self.get_config("form_template_path")
         self.enable_protection = self.get_config("enable_form_protection", True)
         self.auto_validate = self.get_config("auto_validate_forms", True)
+        # Same setting ExcelService uses for its exports: "openpyxl" or "xlsxwriter"
+        self.export_engine = self.get_config("export_engine", "openpyxl")
 
     def initialize(self) -> None:
         """Initialize the form service."""
@@ -266,6 +305,11 @@ class FormService(BaseService):
             logger.error(f"Form not found: {form_id}")
             return False
 
+        if self.export_engine == "xlsxwriter":
+            if XLSXWRITER_AVAILABLE:
+                return self._create_form_workbook_xlsxwriter(form, output_path)
+            logger.warning("xlsxwriter not available - creating form with openpyxl")
+
         try:
             # Create workbook
             wb = Workbook()
@@ -285,6 +329,8 @@ class FormService(BaseService):
 
             # Add fields
             current_row = 4
+            # One list validation per distinct option list, covering all its cells
+            dropdowns: dict[tuple, DataValidation] = {}
             for field in form.fields:
                 # Label
                 ws[f"A{current_row}"] = field.label
@@ -303,11 +349,15 @@ class FormService(BaseService):
 
                 # Apply validation
                 if field.field_type == "dropdown" and field.options:
-                    dv = DataValidation(
-                        type="list", formula1=f'"{",".join(field.options)}"', showDropDown=True
-                    )
+                    options = tuple(field.options)
+                    dv = dropdowns.get(options)
+                    if dv is None:
+                        dv = DataValidation(
+                            type="list", formula1=f'"{",".join(options)}"', showDropDown=True
+                        )
+                        ws.add_data_validation(dv)
+                        dropdowns[options] = dv
                     dv.add(ws[input_cell])
-                    ws.add_data_validation(dv)
 
                 elif field.validation:
                     dv = DataValidation(
@@ -360,7 +410,7 @@ class FormService(BaseService):
 
                 # Protect sheet
                 ws.protection.sheet = True
-                ws.protection.password = "resource_allocation"
+                ws.protection.password = _FORM_PASSWORD
 
             # Adjust column widths
             ws.column_dimensions["A"].width = 20
@@ -377,6 +427,107 @@ class FormService(BaseService):
             logger.error(f"Failed to create form workbook: {e}")
             return False
 
+    def _create_form_workbook_xlsxwriter(self, form: ExcelForm, output_path: str) -> bool:
+        """Write the form with xlsxwriter, streaming rows top to bottom.
+
+        Produces the same layout as the openpyxl path. Each style is registered
+        once as a shared format, and constant-memory mode requires every cell
+        to be written in row order.
+        """
+        try:
+            wb = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+            ws = wb.add_worksheet("Form")
+            title_fmt = wb.add_format({"font_size": 16, "bold": True})
+            description_fmt = wb.add_format({"font_size": 12, "italic": True})
+            bold_fmt = wb.add_format({"bold": True})
+            help_fmt = wb.add_format({"font_size": 10, "italic": True, "font_color": "#808080"})
+            input_fmt = wb.add_format(
+                {"bg_color": "#F0F0F0", "align": "left", "valign": "vcenter", "locked": False}
+            )
+            submit_fmt = wb.add_format(
+                {
+                    "bold": True,
+                    "font_color": "#FFFFFF",
+                    "bg_color": "#007BFF",
+                    "align": "center",
+                    "valign": "vcenter",
+                }
+            )
+
+            ws.set_column("A:A", 20)
+            ws.set_column("B:B", 5)
+            ws.set_column("C:C", 30)
+            ws.set_column("D:D", 40)
+
+            ws.merge_range(0, 0, 0, 3, form.title, title_fmt)
+            if form.description:
+                ws.merge_range(1, 0, 1, 3, form.description, description_fmt)
+
+            # Rows are 0-based here; the openpyxl layout starts fields on row 4
+            current_row = 3
+            for field in form.fields:
+                label = f"{field.label} *" if field.required else field.label
+                ws.write(current_row, 0, label, bold_fmt)
+
+                field.cell_reference = f"C{current_row + 1}"
+                if field.default:
+                    ws.write(current_row, 2, field.default, input_fmt)
+                else:
+                    ws.write_blank(current_row, 2, None, input_fmt)
+
+                if field.field_type == "dropdown" and field.options:
+                    options = {"validate": "list", "source": field.options}
+                    ws.data_validation(current_row, 2, current_row, 2, options)
+                elif field.validation:
+                    options = self._xlsxwriter_validation(field.validation)
+                    ws.data_validation(current_row, 2, current_row, 2, options)
+
+                if field.help_text:
+                    ws.write(current_row, 3, field.help_text, help_fmt)
+
+                current_row += 2
+
+            ws.merge_range(current_row + 1, 0, current_row + 1, 2, "Click to Submit", submit_fmt)
+            ws.write(current_row + 3, 0, "Instructions:", bold_fmt)
+            ws.write(current_row + 4, 0, "1. Fill in all required fields (marked with *)")
+            ws.write(current_row + 5, 0, "2. Save the file when complete")
+            ws.write(current_row + 6, 0, "3. Submit using the button above")
+
+            if self.enable_protection and form.protected:
+                ws.protect(_FORM_PASSWORD)
+
+            wb.close()
+            logger.info(f"Form workbook created: {output_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to create form workbook: {e}")
+            return False
+
+    @staticmethod
+    def _xlsxwriter_validation(validation: ExcelValidation) -> dict[str, Any]:
+        """Translate an ExcelValidation into xlsxwriter ``data_validation`` options."""
+        options = {
+            "validate": _XLSXWRITER_VALIDATE.get(validation.type, validation.type),
+            "show_error": True,
+            "error_title": "Validation Error",
+        }
+        if validation.error_message:
+            options["error_message"] = validation.error_message
+
+        # Custom validations are a single formula with no comparison
+        if validation.type == "custom":
+            options["value"] = validation.formula1
+            return options
+
+        options["criteria"] = _XLSXWRITER_CRITERIA.get(validation.operator, validation.operator)
+        if validation.operator in ("between", "notBetween"):
+            options["minimum"] = validation.formula1
+            options["maximum"] = validation.formula2
+        else:
+            options["value"] = validation.formula1
+        return options
+
     @timer
     @error_handler
     def read_form_submission(self, file_path: str, form_id: str) -> dict | None:
@@ -407,24 +558,19 @@ class FormService(BaseService):
                 "data": {},
             }
 
-            for field in form.fields:
-                if field.cell_reference:
-                    # Extract row and column from cell reference
-                    import re
-
-                    match = re.match(r"([A-Z]+)(\d+)", field.cell_reference)
-                    if match:
-                        col_letter = match.group(1)
-                        row_num = int(match.group(2))
-
-                        # Read value
-                        if self.excel_service.use_xlwings:
-                            value = sheet.range(field.cell_reference).value
-                        else:
-                            col_num = ord(col_letter) - ord("A") + 1
-                            value = sheet.cell(row=row_num, column=col_num).value
-
-                        submission["data"][field.name] = value
+            cells = [
+                (field.name, coordinate_to_tuple(field.cell_reference))
+                for field in form.fields
+                if field.cell_reference
+            ]
+            if cells:
+                # Read the block spanning every input cell in one call
+                rows = [row for _, (row, _) in cells]
+                cols = [col for _, (_, col) in cells]
+                min_row, min_col = min(rows), min(cols)
+                block = self._read_block(sheet, min_row, max(rows), min_col, max(cols))
+                for name, (row, col) in cells:
+                    submission["data"][name] = block[row - min_row][col - min_col]
 
             # Validate submission
             if self.auto_validate:
@@ -445,6 +591,23 @@ class FormService(BaseService):
             logger.error(f"Failed to read form submission: {e}")
             return None
 
+    def _read_block(
+        self, sheet: Any, min_row: int, max_row: int, min_col: int, max_col: int
+    ) -> list[Sequence]:
+        """Read a rectangle of cell values as rows (1-based, inclusive bounds)."""
+        if self.excel_service.use_xlwings:
+            # One COM round-trip; ndim=2 keeps single-cell/row ranges as nested lists
+            return sheet.range((min_row, min_col), (max_row, max_col)).options(ndim=2).value
+        return list(
+            sheet.iter_rows(
+                min_row=min_row,
+                max_row=max_row,
+                min_col=min_col,
+                max_col=max_col,
+                values_only=True,
+            )
+        )
+
     def validate_submission(self, submission: dict, form: ExcelForm) -> list[str]:
         """Validate form submission.
 
@@ -538,21 +701,27 @@ class FormService(BaseService):
                 return False
 
             # Convert to DataFrame
-            data = []
-            for submission in submissions:
-                row = {
-                    "Form ID": submission["form_id"],
-                    "Timestamp": submission["timestamp"],
-                    "File Path": submission["file_path"],
-                    "Valid": submission.get("is_valid", "Unknown"),
-                }
-                row.update(submission.get("data", {}))
-                data.append(row)
-
-            df = pd.DataFrame(data)
+            df = pd.DataFrame.from_records(
+                [
+                    {
+                        "Form ID": submission["form_id"],
+                        "Timestamp": submission["timestamp"],
+                        "File Path": submission["file_path"],
+                        "Valid": submission.get("is_valid", "Unknown"),
+                        **submission.get("data", {}),
+                    }
+                    for submission in submissions
+                ]
+            )
 
             # Export to Excel
-            df.to_excel(output_path, index=False)
+            if self.export_engine == "xlsxwriter" and XLSXWRITER_AVAILABLE:
+                with pd.ExcelWriter(
+                    output_path, engine="xlsxwriter", datetime_format="yyyy-mm-dd hh:mm:ss"
+                ) as writer:
+                    df.to_excel(writer, index=False)
+            else:
+                df.to_excel(output_path, index=False)
 
             logger.info(f"Exported {len(submissions)} submissions to: {output_path}")
             return True
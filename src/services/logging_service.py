@@ -1,5 +1,6 @@
 """Logging service for application-wide logging."""
 
+import os
 import sys
 from contextlib import suppress
 from datetime import datetime
@@ -10,6 +11,11 @@ from loguru import logger
 
 from src.core.base_service import BaseService
 
+# loguru's numeric values for the levels the helpers below short-circuit on
+_DEBUG_NO = 10
+_INFO_NO = 20
+_WARNING_NO = 30
+
 
 class LoggingService(BaseService):
     """Service for centralized logging management.
@@ -42,6 +48,8 @@ class LoggingService(BaseService):
 
         # Log handlers
         self.handlers = []
+        # Numeric threshold checked by every handler's filter; see set_level
+        self._level_no = 0
 
         # Configure loguru
         self._configure_loguru()
@@ -54,6 +62,7 @@ class LoggingService(BaseService):
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Add handlers
+        self._level_no = logger.level(self.log_level.upper()).no
         self._add_file_handler()
         self._add_console_handler()
 
@@ -93,13 +102,24 @@ class LoggingService(BaseService):
         # Set activation levels
         logger.enable("src")
 
+    def _level_filter(self, record: dict) -> bool:
+        """Drop records below the current level.
+
+        Handlers are added at level 0 with this filter, so changing the level
+        doesn't require removing and re-adding them. The debug/info/warning
+        helpers check the same threshold up front, so disabled messages never
+        reach loguru at all.
+        """
+        return record["level"].no >= self._level_no
+
     def _add_file_handler(self):
         """Add file handler with rotation."""
         handler_id = logger.add(
             self.log_file,
             rotation=self.max_file_size,
             retention=self.backup_count,
-            level=self.log_level,
+            level=0,
+            filter=self._level_filter,
             format=self.log_format,
             backtrace=True,
             diagnose=True,
@@ -110,7 +130,11 @@ class LoggingService(BaseService):
     def _add_console_handler(self):
         """Add console handler."""
         handler_id = logger.add(
-            sys.stderr, level=self.log_level, format=self.log_format, colorize=True
+            sys.stderr,
+            level=0,
+            filter=self._level_filter,
+            format=self.log_format,
+            colorize=True,
         )
         self.handlers.append(handler_id)
 
@@ -118,24 +142,15 @@ class LoggingService(BaseService):
         """Add JSON file handler."""
         json_file = self.log_file.with_suffix(".json")
 
-        def json_format(record):
-            """Format log record as JSON."""
-            return {
-                "timestamp": record["time"].isoformat(),
-                "level": record["level"].name,
-                "logger": record["name"],
-                "function": record["function"],
-                "line": record["line"],
-                "message": record["message"],
-                "extra": record.get("extra", {}),
-            }
-
+        # serialize=True makes loguru emit the full record (time, level, name,
+        # function, line, extra) as JSON; the format only shapes the "text" field
         handler_id = logger.add(
             json_file,
             rotation=self.max_file_size,
             retention=self.backup_count,
-            level=self.log_level,
-            format=json_format,
+            level=0,
+            filter=self._level_filter,
+            format="{message}",
             serialize=True,
             enqueue=True,
         )
@@ -147,19 +162,10 @@ class LoggingService(BaseService):
         Args:
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
         """
+        # Existing handlers pick up the new threshold through _level_filter
+        self._level_no = logger.level(level.upper()).no
         self.log_level = level.upper()
 
-        # Update existing handlers
-        for handler_id in self.handlers:
-            logger.remove(handler_id)
-
-        self.handlers = []
-        self._add_file_handler()
-        self._add_console_handler()
-
-        if self.json_logs:
-            self._add_json_handler()
-
         logger.info(f"Log level changed to: {self.log_level}")
 
     def log(self, level: str, message: str, **kwargs):
@@ -170,10 +176,13 @@ class LoggingService(BaseService):
             message: Log message.
             **kwargs: Additional context.
         """
-        level = level.upper()
+        self._emit(level.upper(), message, kwargs)
 
-        if kwargs:
-            logger.bind(**kwargs).log(level, message)
+    @staticmethod
+    def _emit(level: str, message: str, context: dict[str, Any]) -> None:
+        """Send a message at an already-normalized level name."""
+        if context:
+            logger.bind(**context).log(level, message)
         else:
             logger.log(level, message)
 
@@ -184,7 +193,8 @@ class LoggingService(BaseService):
             message: Log message.
             **kwargs: Additional context.
         """
-        self.log("DEBUG", message, **kwargs)
+        if self._level_no <= _DEBUG_NO:
+            self._emit("DEBUG", message, kwargs)
 
     def info(self, message: str, **kwargs):
         """Log info message.
@@ -193,7 +203,8 @@ class LoggingService(BaseService):
             message: Log message.
             **kwargs: Additional context.
         """
-        self.log("INFO", message, **kwargs)
+        if self._level_no <= _INFO_NO:
+            self._emit("INFO", message, kwargs)
 
     def warning(self, message: str, **kwargs):
         """Log warning message.
@@ -202,7 +213,8 @@ class LoggingService(BaseService):
             message: Log message.
             **kwargs: Additional context.
         """
-        self.log("WARNING", message, **kwargs)
+        if self._level_no <= _WARNING_NO:
+            self._emit("WARNING", message, kwargs)
 
     def error(self, message: str, **kwargs):
         """Log error message.
@@ -211,7 +223,7 @@ class LoggingService(BaseService):
             message: Log message.
             **kwargs: Additional context.
         """
-        self.log("ERROR", message, **kwargs)
+        self._emit("ERROR", message, kwargs)
 
     def critical(self, message: str, **kwargs):
         """Log critical message.
@@ -220,7 +232,7 @@ class LoggingService(BaseService):
             message: Log message.
             **kwargs: Additional context.
         """
-        self.log("CRITICAL", message, **kwargs)
+        self._emit("CRITICAL", message, kwargs)
 
     def exception(self, message: str, **kwargs):
         """Log exception with traceback.
@@ -278,11 +290,8 @@ class LoggingService(BaseService):
             return []
 
         try:
-            with open(self.log_file) as f:
-                all_lines = f.readlines()
-
             # Get last N lines
-            recent = all_lines[-lines:] if lines < len(all_lines) else all_lines
+            recent = self._tail(self.log_file, lines)
 
             # Filter by level if specified
             if level:
@@ -299,6 +308,32 @@ class LoggingService(BaseService):
             logger.error(f"Failed to read log file: {e}")
             return []
 
+    @staticmethod
+    def _tail(path: Path, lines: int, block_size: int = 8192) -> list[str]:
+        """Read the last ``lines`` lines of a file without loading all of it.
+
+        Blocks are read backwards from the end until they hold enough line
+        breaks, so memory use depends on ``lines`` rather than the file size.
+        """
+        if lines <= 0:
+            return []
+
+        chunks = []
+        newlines = 0
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            # One extra line break guarantees the first returned line is whole
+            while pos > 0 and newlines <= lines:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+
+        tail = b"".join(reversed(chunks)).splitlines(keepends=True)[-lines:]
+        return [line.decode("utf-8", errors="replace") for line in tail]
+
     def clear_logs(self) -> bool:
         """Clear log files.
 
@@ -340,19 +375,20 @@ class LoggingService(BaseService):
 
             archive_path = archive_path or Path(f"logs_archive_{datetime.now():%Y%m%d_%H%M%S}.zip")
 
-            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                # Add main log
-                if self.log_file.exists():
-                    zf.write(self.log_file, self.log_file.name)
-
-                # Add JSON log
-                json_file = self.log_file.with_suffix(".json")
-                if json_file.exists():
-                    zf.write(json_file, json_file.name)
-
-                # Add rotated logs
-                for backup in self.log_file.parent.glob(f"{self.log_file.stem}*.log*"):
-                    zf.write(backup, backup.name)
+            # Main log, JSON log and rotated logs; the glob also matches the main
+            # log, so duplicates are dropped before anything is written
+            candidates = [
+                self.log_file,
+                self.log_file.with_suffix(".json"),
+                *self.log_file.parent.glob(f"{self.log_file.stem}*.log*"),
+            ]
+            files = [path for path in dict.fromkeys(candidates) if path.is_file()]
+
+            # Logs are plain text; fast compression is far cheaper than level 6
+            # for a small loss in ratio
+            with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                for path in files:
+                    zf.write(path, path.name)
 
             logger.info(f"Logs archived to: {archive_path}")
             return True
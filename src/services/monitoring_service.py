@@ -4,12 +4,20 @@ Provides real-time monitoring, performance tracking, and automated alerting.
 """
 
 import asyncio
+import csv
 import json
 import logging
+import os
+import queue
 import smtplib
+import stat
+import threading
 import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import suppress
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
@@ -18,9 +26,24 @@ from typing import Any
 import psutil
 from cachetools import TTLCache
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` as compact UTF-8 JSON, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
 @dataclass
 class PerformanceMetric:
     """Performance metric data structure."""
@@ -67,8 +90,13 @@ class MonitoringService:
         self.config_path = config_path or Path("config/monitoring.json")
         self.config = self._load_config()
 
-        # Metrics storage (in-memory with TTL cache)
-        self.metrics_cache = TTLCache(maxsize=10000, ttl=3600)  # 1 hour TTL
+        # Metrics storage: ring buffer in recording order, oldest dropped first
+        self.metrics_cache: deque[PerformanceMetric] = deque(maxlen=10000)
+        self.metrics_ttl = timedelta(hours=1)
+        # Self-observability: metrics recorded, and metrics evicted because the
+        # buffer was full rather than because they expired
+        self._metric_writes = 0
+        self._metric_overwrites = 0
         self.alerts_cache = TTLCache(maxsize=1000, ttl=86400)  # 24 hour TTL
 
         # Performance thresholds
@@ -81,9 +109,42 @@ class MonitoringService:
             "duplicate_detection_rate": {"warning": 0.95, "critical": 0.90},  # percentage
         }
 
-        # Alert state tracking
+        # Alert state tracking; resolved alerts leave active_alerts and the
+        # history keeps only the most recent alerts
         self.active_alerts: dict[str, Alert] = {}
-        self.alert_history: list[Alert] = []
+        self.alert_history: deque[Alert] = deque(maxlen=self.config["alert_history_max"])
+        # alert_id -> monotonic time it last fired, for the alert_cooldown window
+        self._last_alert_fire: dict[str, float] = {}
+        # (day, alerts created that day), so the summary needn't scan history
+        self._alerts_today: tuple[date, int] = (date.today(), 0)
+
+        # Alert SMTP connection, opened on the first email and reused after;
+        # guarded by _smtp_lock since SMTP sessions are strictly sequential
+        self._smtp: smtplib.SMTP | None = None
+        self._smtp_lock = threading.Lock()
+        # Alert emails are sent by a background thread so a slow SMTP server
+        # never blocks record_metric; when the queue is full the oldest
+        # pending alert is dropped and counted
+        self._alert_queue: queue.Queue[Alert | None] = queue.Queue(maxsize=256)
+        self._alert_sender: threading.Thread | None = None
+        self._alert_sender_lock = threading.Lock()
+        self.alert_drops = 0
+
+        # Expensive health probes: the Excel probe launches Excel, so its result
+        # is reused for excel_probe_ttl seconds; the service import check only
+        # needs to pass once per process
+        self.excel_probe_ttl = 3600
+        self._last_excel_probe: tuple[float, dict[str, Any]] | None = None
+        self._application_health: dict[str, Any] | None = None
+        # System CPU times at the previous health check; usage is measured
+        # between checks instead of sleeping through a one-second sample
+        self._cpu_times = psutil.cpu_times()
+        self._cpu_percent = 0.0
+        # Directories checked by the filesystem probe; writing a test file is
+        # done at most every fs_write_probe_interval seconds, os.access otherwise
+        self._fs_check_paths = (Path("data"), Path("outputs"), Path("logs"), Path("config"))
+        self.fs_write_probe_interval = 3600
+        self._last_fs_write_probe: float | None = None
 
         # Monitoring state
         self.monitoring_active = False
@@ -106,6 +167,7 @@ class MonitoringService:
             "email_username": "",
             "email_password": "",
             "metrics_retention_hours": 24,
+            "alert_history_max": 10000,
             "enable_performance_tracking": True,
             "enable_error_tracking": True,
             "enable_business_metrics": True,
@@ -135,9 +197,13 @@ class MonitoringService:
             unit: Unit of measurement
             tags: Additional tags for the metric
         """
-        tags = tags or {}
-        threshold_warning = self.thresholds.get(name, {}).get("warning")
-        threshold_critical = self.thresholds.get(name, {}).get("critical")
+        # Most metrics have no thresholds; look the name up once
+        limits = self.thresholds.get(name)
+        if limits:
+            threshold_warning = limits.get("warning")
+            threshold_critical = limits.get("critical")
+        else:
+            threshold_warning = threshold_critical = None
 
         metric = PerformanceMetric(
             name=name,
@@ -146,64 +212,112 @@ class MonitoringService:
             unit=unit,
             threshold_warning=threshold_warning,
             threshold_critical=threshold_critical,
-            tags=tags,
+            tags=tags or {},
         )
 
-        # Store metric
-        cache_key = f"{name}_{int(time.time())}"
-        self.metrics_cache[cache_key] = metric
+        # Store metric, expiring anything past the TTL from the old end
+        if len(self.metrics_cache) == self.metrics_cache.maxlen:
+            self._metric_overwrites += 1
+        self.metrics_cache.append(metric)
+        self._metric_writes += 1
+        expired_before = metric.timestamp - self.metrics_ttl
+        while self.metrics_cache[0].timestamp < expired_before:
+            self.metrics_cache.popleft()
 
         # Check for threshold violations
-        self._check_thresholds(metric)
+        if limits:
+            self._check_thresholds(metric)
 
-        logger.debug(f"Recorded metric: {name}={value} {unit}")
+        # Lazy arguments: this runs on every timer exit and debug is usually off
+        logger.debug("Recorded metric: %s=%s %s", name, value, unit)
 
     def _check_thresholds(self, metric: PerformanceMetric) -> None:
         """Check if metric violates thresholds and create alerts."""
-        if not metric.threshold_warning and not metric.threshold_critical:
+        value = metric.value
+        critical = metric.threshold_critical
+        warning = metric.threshold_warning
+
+        # Check critical threshold first
+        if critical and value >= critical:
+            alert_severity, threshold = "critical", critical
+        elif warning and value >= warning:
+            alert_severity, threshold = "warning", warning
+        else:
             return
 
-        alert_severity = None
-        threshold = None
+        alert_id = f"{metric.name}_{alert_severity}"
+
+        # Check if alert already exists and is not resolved
+        existing = self.active_alerts.get(alert_id)
+        if existing is not None and not existing.resolved:
+            return  # Avoid duplicate alerts
+
+        alert = Alert(
+            severity=alert_severity,
+            title=f"{metric.name.replace('_', ' ').title()} Threshold Exceeded",
+            message=f"{metric.name} is {metric.value} {metric.unit}, "
+            f"exceeding {alert_severity} threshold of {threshold} {metric.unit}",
+            timestamp=metric.timestamp,
+            metric_name=metric.name,
+            current_value=metric.value,
+            threshold=threshold,
+        )
 
-        # Check critical threshold first
-        if metric.threshold_critical and metric.value >= metric.threshold_critical:
-            alert_severity = "critical"
-            threshold = metric.threshold_critical
-        elif metric.threshold_warning and metric.value >= metric.threshold_warning:
-            alert_severity = "warning"
-            threshold = metric.threshold_warning
-
-        if alert_severity:
-            alert_id = f"{metric.name}_{alert_severity}"
-
-            # Check if alert already exists and is not resolved
-            if alert_id in self.active_alerts and not self.active_alerts[alert_id].resolved:
-                return  # Avoid duplicate alerts
-
-            alert = Alert(
-                severity=alert_severity,
-                title=f"{metric.name.replace('_', ' ').title()} Threshold Exceeded",
-                message=f"{metric.name} is {metric.value} {metric.unit}, "
-                f"exceeding {alert_severity} threshold of {threshold} {metric.unit}",
-                timestamp=metric.timestamp,
-                metric_name=metric.name,
-                current_value=metric.value,
-                threshold=threshold,
-            )
-
-            self._create_alert(alert)
+        self._create_alert(alert)
 
     def _create_alert(self, alert: Alert) -> None:
-        """Create and process a new alert."""
+        """Create and process a new alert.
+
+        An alert with the same id that fired within ``alert_cooldown`` seconds
+        suppresses this one, so a flapping metric can't flood history or email.
+        """
         alert_id = f"{alert.metric_name}_{alert.severity}"
+
+        now = time.monotonic()
+        last_fired = self._last_alert_fire.get(alert_id)
+        if last_fired is not None and now - last_fired < self.config["alert_cooldown"]:
+            logger.debug("Alert suppressed during cooldown: %s", alert_id)
+            return
+        self._last_alert_fire[alert_id] = now
+
         self.active_alerts[alert_id] = alert
         self.alert_history.append(alert)
 
+        day, count = self._alerts_today
+        alert_day = alert.timestamp.date()
+        self._alerts_today = (alert_day, count + 1 if day == alert_day else 1)
+
         logger.warning(f"Alert created: {alert.title} - {alert.message}")
 
         # Send notifications
         if self.config.get("email_enabled"):
+            self._enqueue_email_alert(alert)
+
+    def _enqueue_email_alert(self, alert: Alert) -> None:
+        """Hand an alert to the background sender without blocking."""
+        with self._alert_sender_lock:
+            if self._alert_sender is None:
+                self._alert_sender = threading.Thread(
+                    target=self._alert_sender_loop, name="alert-email-sender", daemon=True
+                )
+                self._alert_sender.start()
+
+        while True:
+            try:
+                self._alert_queue.put_nowait(alert)
+                return
+            except queue.Full:
+                with suppress(queue.Empty):
+                    dropped = self._alert_queue.get_nowait()
+                    self.alert_drops += 1
+                    logger.warning(f"Alert email queue full, dropped: {dropped.title}")
+
+    def _alert_sender_loop(self) -> None:
+        """Send queued alert emails until a None sentinel arrives."""
+        while True:
+            alert = self._alert_queue.get()
+            if alert is None:
+                break
             self._send_email_alert(alert)
 
     def _send_email_alert(self, alert: Alert) -> None:
@@ -239,19 +353,72 @@ Resource Allocation Monitoring System
 
             msg.attach(MIMEText(body, "plain"))
 
-            server = smtplib.SMTP(self.config["email_smtp_host"], self.config["email_smtp_port"])
-            server.starttls()
-            if self.config["email_username"]:
-                server.login(self.config["email_username"], self.config["email_password"])
-
-            server.send_message(msg)
-            server.quit()
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().send_message(msg)
+                except (
+                    smtplib.SMTPServerDisconnected,
+                    smtplib.SMTPConnectError,
+                    ConnectionError,
+                ):
+                    # The server dropped an idle connection after the health
+                    # check; reconnect once and retry. Rejections and bad
+                    # credentials would only fail again, so they aren't retried
+                    self._close_smtp()
+                    self._get_smtp().send_message(msg)
 
             logger.info(f"Alert email sent for: {alert.title}")
 
         except Exception as e:
             logger.error(f"Failed to send alert email: {e}")
 
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Get the alert SMTP connection, reconnecting if it is stale.
+
+        Callers must hold ``_smtp_lock``.
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+
+        server = smtplib.SMTP(self.config["email_smtp_host"], self.config["email_smtp_port"])
+        try:
+            server.starttls()
+            if self.config["email_username"]:
+                server.login(self.config["email_username"], self.config["email_password"])
+        except Exception:
+            with suppress(Exception):
+                server.close()
+            raise
+
+        self._smtp = server
+        return server
+
+    def _close_smtp(self) -> None:
+        """Close the alert SMTP connection, if any. Callers must hold ``_smtp_lock``."""
+        if self._smtp is None:
+            return
+        with suppress(Exception):
+            self._smtp.quit()
+        with suppress(Exception):
+            self._smtp.close()
+        self._smtp = None
+
+    def close(self) -> None:
+        """Send any queued alert emails, then release the SMTP connection."""
+        with self._alert_sender_lock:
+            if self._alert_sender is not None:
+                self._alert_queue.put(None)
+                self._alert_sender.join()
+                self._alert_sender = None
+
+        with self._smtp_lock:
+            self._close_smtp()
+
     def check_system_health(self) -> dict[str, Any]:
         """
         Perform comprehensive system health check.
@@ -283,7 +450,7 @@ Resource Allocation Monitoring System
                 "free_gb": disk.free / 1024 / 1024 / 1024,
             }
 
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = self._cpu_percent_since_last_check()
             health_status["checks"]["cpu"] = {
                 "status": "healthy" if cpu_percent < 80 else "warning",
                 "usage_percent": cpu_percent,
@@ -324,8 +491,32 @@ Resource Allocation Monitoring System
 
         return health_status
 
+    def _cpu_percent_since_last_check(self) -> float:
+        """System-wide CPU usage since the previous call (or service start).
+
+        Back-to-back calls with no elapsed CPU time repeat the last reading.
+        """
+        previous, current = self._cpu_times, psutil.cpu_times()
+        total = sum(current) - sum(previous)
+        if total <= 0:
+            return self._cpu_percent
+
+        idle = (current.idle - previous.idle) + (
+            getattr(current, "iowait", 0.0) - getattr(previous, "iowait", 0.0)
+        )
+        self._cpu_times = current
+        self._cpu_percent = round(min(max((total - idle) / total * 100, 0.0), 100.0), 1)
+        return self._cpu_percent
+
     def _check_application_health(self) -> dict[str, Any]:
-        """Check application-specific health indicators."""
+        """Check application-specific health indicators.
+
+        A passing result is kept for the life of the service; failures are
+        re-checked on every call.
+        """
+        if self._application_health is not None:
+            return self._application_health
+
         try:
             from src.core.gas_compatible_allocator import GASCompatibleAllocator
             from src.services.excel_service import ExcelService
@@ -334,17 +525,22 @@ Resource Allocation Monitoring System
             _ = GASCompatibleAllocator()
             _ = ExcelService()
 
-            return {
+            self._application_health = {
                 "status": "healthy",
                 "core_allocator": "operational",
                 "excel_service": "operational",
                 "services_loaded": True,
             }
+            return self._application_health
         except Exception as e:
             return {"status": "critical", "error": str(e), "services_loaded": False}
 
     def _check_excel_connectivity(self) -> dict[str, Any]:
-        """Check Excel application connectivity."""
+        """Check Excel application connectivity, at most once per ``excel_probe_ttl``."""
+        now = time.monotonic()
+        if self._last_excel_probe and now - self._last_excel_probe[0] < self.excel_probe_ttl:
+            return self._last_excel_probe[1]
+
         try:
             import xlwings as xw
 
@@ -352,34 +548,73 @@ Resource Allocation Monitoring System
             app = xw.App(visible=False)
             app.quit()
 
-            return {"status": "healthy", "excel_available": True, "xlwings_version": xw.__version__}
+            result = {
+                "status": "healthy",
+                "excel_available": True,
+                "xlwings_version": xw.__version__,
+            }
         except Exception as e:
-            return {"status": "warning", "excel_available": False, "error": str(e)}
+            result = {"status": "warning", "excel_available": False, "error": str(e)}
+
+        self._last_excel_probe = (now, result)
+        return result
 
     def _check_filesystem_health(self) -> dict[str, Any]:
         """Check filesystem health and accessibility."""
-        check_paths = [Path("data"), Path("outputs"), Path("logs"), Path("config")]
+        now = time.monotonic()
+        write_probe = (
+            self._last_fs_write_probe is None
+            or now - self._last_fs_write_probe >= self.fs_write_probe_interval
+        )
+        if write_probe:
+            self._last_fs_write_probe = now
 
         status = "healthy"
         path_statuses = {}
 
-        for path in check_paths:
+        for path in self._fs_check_paths:
             try:
-                if path.exists() and path.is_dir():
-                    # Check read/write permissions
+                # One stat answers both "exists" and "is a directory"
+                try:
+                    is_dir = stat.S_ISDIR(os.stat(path).st_mode)
+                except FileNotFoundError:
+                    is_dir = False
+
+                if not is_dir:
+                    path_statuses[str(path)] = "missing"
+                    status = "warning"
+                    continue
+
+                # Check read/write permissions
+                if write_probe:
                     test_file = path / ".health_check"
                     test_file.write_text("health check")
                     test_file.unlink()
-                    path_statuses[str(path)] = "accessible"
-                else:
-                    path_statuses[str(path)] = "missing"
-                    status = "warning"
+                elif not os.access(path, os.R_OK | os.W_OK):
+                    raise PermissionError(f"no read/write access to {path}")
+                path_statuses[str(path)] = "accessible"
             except Exception as e:
                 path_statuses[str(path)] = f"error: {e}"
                 status = "critical"
 
         return {"status": status, "paths": path_statuses}
 
+    def _recent_metrics(self, since: datetime | None = None) -> Iterator[PerformanceMetric]:
+        """Return unexpired metrics recorded at or after ``since``, oldest first.
+
+        The buffer is in recording order, so only the recent tail is scanned.
+        """
+        cutoff = datetime.now() - self.metrics_ttl
+        if since is not None and since > cutoff:
+            cutoff = since
+
+        recent = []
+        for metric in reversed(self.metrics_cache):
+            if metric.timestamp < cutoff:
+                break
+            recent.append(metric)
+        return reversed(recent)
+
     def get_performance_summary(self, hours: int = 24) -> dict[str, Any]:
         """
         Get performance summary for the specified time period.
@@ -392,35 +627,41 @@ Resource Allocation Monitoring System
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
 
-        # Filter metrics by time
-        recent_metrics = [
-            metric for metric in self.metrics_cache.values() if metric.timestamp >= cutoff_time
-        ]
-
-        # Group metrics by name
-        metrics_by_name = {}
-        for metric in recent_metrics:
-            if metric.name not in metrics_by_name:
-                metrics_by_name[metric.name] = []
-            metrics_by_name[metric.name].append(metric)
+        # Accumulate running statistics per metric name in a single pass
+        # (count, sum, min, max, latest, unit of the first metric seen)
+        stats_by_name: dict[str, list] = {}
+        total_metrics = 0
+        for metric in self._recent_metrics(cutoff_time):
+            total_metrics += 1
+            value = metric.value
+            stats = stats_by_name.get(metric.name)
+            if stats is None:
+                stats_by_name[metric.name] = [1, value, value, value, value, metric.unit]
+                continue
+            stats[0] += 1
+            stats[1] += value
+            if value < stats[2]:
+                stats[2] = value
+            if value > stats[3]:
+                stats[3] = value
+            stats[4] = value
 
         # Calculate summary statistics
         summary = {
             "period_hours": hours,
-            "total_metrics": len(recent_metrics),
-            "metric_types": len(metrics_by_name),
+            "total_metrics": total_metrics,
+            "metric_types": len(stats_by_name),
             "metrics": {},
         }
 
-        for name, metrics in metrics_by_name.items():
-            values = [m.value for m in metrics]
+        for name, (count, total, minimum, maximum, latest, unit) in stats_by_name.items():
             summary["metrics"][name] = {
-                "count": len(values),
-                "avg": sum(values) / len(values),
-                "min": min(values),
-                "max": max(values),
-                "latest": values[-1] if values else None,
-                "unit": metrics[0].unit if metrics else "unknown",
+                "count": count,
+                "avg": total / count,
+                "min": minimum,
+                "max": maximum,
+                "latest": latest,
+                "unit": unit,
             }
 
         return summary
@@ -434,17 +675,27 @@ Resource Allocation Monitoring System
                     active_by_severity[alert.severity] = 0
                 active_by_severity[alert.severity] += 1
 
+        day, count = self._alerts_today
         return {
             "active_alerts": len([a for a in self.active_alerts.values() if not a.resolved]),
-            "total_alerts_today": len(
-                [a for a in self.alert_history if a.timestamp.date() == datetime.now().date()]
-            ),
+            "total_alerts_today": count if day == date.today() else 0,
             "active_by_severity": active_by_severity,
             "latest_alert": self.alert_history[-1].timestamp.isoformat()
             if self.alert_history
             else None,
         }
 
+    def get_buffer_stats(self) -> dict[str, int]:
+        """Get fill level and loss counters for the metric buffer and alert queue."""
+        return {
+            "metrics_ring_writes": self._metric_writes,
+            "metrics_ring_overwrites": self._metric_overwrites,
+            "metrics_ring_capacity": self.metrics_cache.maxlen,
+            "metrics_ring_fill": len(self.metrics_cache),
+            "alert_queue_pending": self._alert_queue.qsize(),
+            "alert_queue_drops": self.alert_drops,
+        }
+
     async def start_monitoring(self) -> None:
         """Start the monitoring service in background."""
         if self.monitoring_active:
@@ -454,17 +705,28 @@ Resource Allocation Monitoring System
         self.monitoring_active = True
         logger.info("Starting monitoring service")
 
+        loop = asyncio.get_running_loop()
         try:
             while self.monitoring_active:
-                # Perform health check
-                self.check_system_health()
+                # Perform health check; it can block (Excel probe, filesystem),
+                # so it runs on a worker thread to keep the event loop free
+                await loop.run_in_executor(None, self.check_system_health)
 
                 # Record system metrics
+                memory_percent, cpu_percent, disk_percent = await loop.run_in_executor(
+                    None, self._sample_system_metrics
+                )
+                self.record_metric("system_memory_percent", memory_percent, "percent")
+                self.record_metric("system_cpu_percent", cpu_percent, "percent")
+                self.record_metric("system_disk_percent", disk_percent, "percent")
+
+                # Record buffer saturation so silent metric/alert loss is visible
+                buffer_stats = self.get_buffer_stats()
+                self.record_metric("metrics_ring_fill", buffer_stats["metrics_ring_fill"])
                 self.record_metric(
-                    "system_memory_percent", psutil.virtual_memory().percent, "percent"
+                    "metrics_ring_overwrites", buffer_stats["metrics_ring_overwrites"]
                 )
-                self.record_metric("system_cpu_percent", psutil.cpu_percent(), "percent")
-                self.record_metric("system_disk_percent", psutil.disk_usage("/").percent, "percent")
+                self.record_metric("alert_queue_drops", buffer_stats["alert_queue_drops"])
 
                 # Sleep until next check
                 await asyncio.sleep(self.config["health_check_interval"])
@@ -475,6 +737,15 @@ Resource Allocation Monitoring System
             self.monitoring_active = False
             logger.info("Monitoring service stopped")
 
+    @staticmethod
+    def _sample_system_metrics() -> tuple[float, float, float]:
+        """Read memory, CPU and disk usage percentages from psutil."""
+        return (
+            psutil.virtual_memory().percent,
+            psutil.cpu_percent(),
+            psutil.disk_usage("/").percent,
+        )
+
     def stop_monitoring(self) -> None:
         """Stop the monitoring service."""
         self.monitoring_active = False
@@ -507,8 +778,10 @@ Resource Allocation Monitoring System
         Returns:
             True if alert was resolved, False if not found
         """
-        if alert_id in self.active_alerts:
-            self.active_alerts[alert_id].resolved = True
+        alert = self.active_alerts.pop(alert_id, None)
+        if alert is not None:
+            # The alert stays in alert_history with its resolved flag set
+            alert.resolved = True
             logger.info(f"Alert resolved: {alert_id}")
             return True
         return False
@@ -522,66 +795,90 @@ Resource Allocation Monitoring System
             format: Export format ('json' or 'csv')
         """
         try:
+            metrics = list(self._recent_metrics())
+
             if format == "json":
-                data = {
-                    "export_timestamp": datetime.now().isoformat(),
-                    "metrics": [
+                # Written record by record rather than building one document
+                with open(output_path, "wb") as f:
+                    f.write(b'{"export_timestamp": ')
+                    f.write(_json_bytes(datetime.now().isoformat()))
+                    f.write(b', "metrics": [')
+                    self._write_json_records(
+                        f,
+                        (
+                            {
+                                "name": m.name,
+                                "value": m.value,
+                                "timestamp": m.timestamp.isoformat(),
+                                "unit": m.unit,
+                                "tags": m.tags,
+                            }
+                            for m in metrics
+                        ),
+                    )
+                    f.write(b'], "alerts": [')
+                    self._write_json_records(
+                        f,
+                        (
+                            {
+                                "severity": a.severity,
+                                "title": a.title,
+                                "message": a.message,
+                                "timestamp": a.timestamp.isoformat(),
+                                "resolved": a.resolved,
+                            }
+                            for a in self.alert_history
+                        ),
+                    )
+                    f.write(b"]}\n")
+
+            elif format == "csv":
+                # Tag keys become extra columns in first-seen order
+                tag_columns = dict.fromkeys(key for m in metrics for key in m.tags)
+                fieldnames = ["timestamp", "name", "value", "unit", *tag_columns]
+
+                with open(output_path, "w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(
                         {
+                            "timestamp": m.timestamp.isoformat(),
                             "name": m.name,
                             "value": m.value,
-                            "timestamp": m.timestamp.isoformat(),
                             "unit": m.unit,
-                            "tags": m.tags,
+                            **m.tags,
                         }
-                        for m in self.metrics_cache.values()
-                    ],
-                    "alerts": [
-                        {
-                            "severity": a.severity,
-                            "title": a.title,
-                            "message": a.message,
-                            "timestamp": a.timestamp.isoformat(),
-                            "resolved": a.resolved,
-                        }
-                        for a in self.alert_history
-                    ],
-                }
-
-                with open(output_path, "w") as f:
-                    json.dump(data, f, indent=2)
-
-            elif format == "csv":
-                import pandas as pd
-
-                metrics_data = [
-                    {
-                        "timestamp": m.timestamp.isoformat(),
-                        "name": m.name,
-                        "value": m.value,
-                        "unit": m.unit,
-                        **m.tags,
-                    }
-                    for m in self.metrics_cache.values()
-                ]
-
-                df = pd.DataFrame(metrics_data)
-                df.to_csv(output_path, index=False)
+                        for m in metrics
+                    )
 
             logger.info(f"Metrics exported to {output_path}")
 
         except Exception as e:
             logger.error(f"Failed to export metrics: {e}")
 
+    @staticmethod
+    def _write_json_records(f, records: Iterable[dict[str, Any]]) -> None:
+        """Write records as the comma-separated items of a JSON array, one per line."""
+        separator = b"\n"
+        for record in records:
+            f.write(separator)
+            f.write(_json_bytes(record))
+            separator = b",\n"
+
 
 # Singleton instance for global access
 _monitoring_service = None
+_monitoring_service_lock = threading.Lock()
 
 
 def get_monitoring_service() -> MonitoringService:
     """Get the global monitoring service instance."""
     global _monitoring_service
     if _monitoring_service is None:
-        _monitoring_service = MonitoringService()
+        # Double-checked so concurrent first calls still create one instance
+        with _monitoring_service_lock:
+            if _monitoring_service is None:
+                _monitoring_service = MonitoringService()
     return _monitoring_service
 
 
@@ -600,18 +897,26 @@ def check_health() -> dict[str, Any]:
 
 # Context manager for performance timing
 class performance_timer:
-    """Context manager for timing operations and recording metrics."""
+    """Context manager for timing operations and recording metrics.
+
+    Uses the monotonic perf_counter clock, so durations are unaffected by
+    wall-clock adjustments.
+    """
+
+    __slots__ = ("metric_name", "tags", "start_ns", "_record_metric")
 
     def __init__(self, metric_name: str, tags: dict[str, str] | None = None):
         self.metric_name = metric_name
         self.tags = tags or {}
-        self.start_time = None
+        self.start_ns: int | None = None
+        # Resolved once so __exit__ records straight to the service
+        self._record_metric = get_monitoring_service().record_metric
 
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
-            duration = time.time() - self.start_time
-            record_metric(self.metric_name, duration, "seconds", self.tags)
+        if self.start_ns is not None:
+            duration = (time.perf_counter_ns() - self.start_ns) / 1e9
+            self._record_metric(self.metric_name, duration, "seconds", self.tags)
@@ -0,0 +1,47 @@
+"""Unit tests for DashboardDataService metric caching."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.services import _excel_cache
+from src.services.dashboard_data_service import DashboardDataService
+
+
+@pytest.fixture
+def misconfigured_log(tmp_path):
+    """Create a Daily Summary Log whose Vehicle Status lacks required columns."""
+    path = tmp_path / "Daily Summary Log.xlsx"
+    pd.DataFrame({"Vehicle": ["BW1", "BW2"]}).to_excel(
+        path, sheet_name="Vehicle Status", index=False
+    )
+    _excel_cache.clear()
+    yield path
+    _excel_cache.clear()
+
+
+class TestDashboardDataService:
+    """Test cases for DashboardDataService."""
+
+    def test_missing_columns_result_is_cached(self, misconfigured_log, mocker):
+        """A None result is reused after TTL expiry while the file is unchanged."""
+        service = DashboardDataService(cache_ttl_seconds=0)
+        spy = mocker.spy(_excel_cache.pd.ExcelFile, "parse")
+
+        assert service.total_operational_vehicles(str(misconfigured_log)) is None
+        assert service.total_operational_vehicles(str(misconfigured_log)) is None
+        assert spy.call_count == 1
+
+    def test_file_edit_invalidates_cached_result(self, misconfigured_log):
+        """Fixing the sheet on disk produces a fresh count."""
+        service = DashboardDataService(cache_ttl_seconds=0)
+        assert service.total_operational_vehicles(str(misconfigured_log)) is None
+
+        pd.DataFrame({"Van ID": ["BW1", "BW2"], "Opnal? Y/N": ["Y", "Y"]}).to_excel(
+            misconfigured_log, sheet_name="Vehicle Status", index=False
+        )
+        stat = misconfigured_log.stat()
+        os.utime(misconfigured_log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert service.total_operational_vehicles(str(misconfigured_log)) == 2
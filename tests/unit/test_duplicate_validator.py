@@ -1,13 +1,19 @@
 """Unit tests for duplicate vehicle validator."""
 
+import json
 import time
 from datetime import datetime
 
+import pytest
+
 from src.services.duplicate_validator import (
+    _UNKNOWN_WAVE,
     DuplicateAssignment,
     DuplicateVehicleValidator,
     ValidationResult,
     VehicleAssignment,
+    _parse_wave_time,
+    _suggest_resolution_impl,
 )
 
 
@@ -140,6 +146,21 @@ class TestDuplicateVehicleValidator:
         assert bw2_result["Validation Status"] == "OK"
         assert bw2_result["Validation Warning"] == ""
 
+    def test_mark_duplicates_does_not_mutate_input(
+        self, duplicate_validator, duplicate_allocation_results
+    ):
+        """Test marking builds new row dicts and leaves the input rows untouched."""
+        originals = [dict(r) for r in duplicate_allocation_results]
+        validation_result = duplicate_validator.validate_allocations(duplicate_allocation_results)
+
+        marked = duplicate_validator.mark_duplicates_in_results(
+            duplicate_allocation_results, validation_result
+        )
+
+        assert duplicate_allocation_results == originals
+        assert all(m is not r for m, r in zip(marked, duplicate_allocation_results, strict=True))
+        assert all(m.items() >= r.items() for m, r in zip(marked, originals, strict=True))
+
     def test_validate_driver_vehicles(self, duplicate_validator):
         """Test validation from driver perspective."""
         allocations = {
@@ -211,6 +232,18 @@ class TestDuplicateVehicleValidator:
         assert duplicate_info["assignment_count"] == 2
         assert len(duplicate_info["assignments"]) == 2
 
+    def test_generate_duplicate_report_json(
+        self, duplicate_validator, duplicate_allocation_results
+    ):
+        """Test JSON report matches the dictionary report."""
+        result = duplicate_validator.validate_allocations(duplicate_allocation_results)
+
+        report = duplicate_validator.generate_duplicate_report(result)
+        decoded = json.loads(duplicate_validator.generate_duplicate_report_json(result))
+
+        assert decoded["duplicates"] == report["duplicates"]
+        assert decoded["duplicate_count"] == 2
+
     def test_strict_mode(self):
         """Test validator in strict mode."""
         validator = DuplicateVehicleValidator(config={"strict_duplicate_validation": True})
@@ -468,6 +501,37 @@ class TestDuplicateVehicleValidator:
         assert "Keep assignment to route CX2" in duplicate.resolution_suggestion
         assert "remove from routes: CX1, CX3" in duplicate.resolution_suggestion
 
+    @pytest.mark.parametrize(
+        ("wave", "minutes"),
+        [
+            ("8:00 AM", 8 * 60),
+            ("8:05am", 8 * 60 + 5),
+            ("12:00 AM", 0),
+            ("12:30 PM", 12 * 60 + 30),
+            ("11:45 PM", 23 * 60 + 45),
+            ("13:15", 13 * 60 + 15),
+            ("9:30  PM", 21 * 60 + 30),
+            ("10:00 AM - 10:30 AM", 10 * 60),
+        ],
+    )
+    def test_parse_wave_time(self, wave, minutes):
+        """Test wave times in 12- and 24-hour forms parse to minutes since midnight."""
+        assert _parse_wave_time(wave) == minutes
+
+    @pytest.mark.parametrize(
+        "wave",
+        ["", "TBD", "8", "8:", "8:5 AM", "-1:30", "1_0:00 PM", "123:00", " 8:00 AM", "8.00 AM"],
+    )
+    def test_parse_wave_time_rejects_malformed(self, wave):
+        """Test malformed wave times sort after every valid time."""
+        assert _parse_wave_time(wave) == _UNKNOWN_WAVE
+
+    def test_resolution_ignores_malformed_wave(self):
+        """Test a malformed wave is never suggested as the assignment to keep."""
+        suggestion = _suggest_resolution_impl((("-1:30", "CX1"), ("8:00 AM", "CX2")))
+
+        assert suggestion.startswith("Suggestion: Keep assignment to route CX2,")
+
     def test_driver_vehicle_validation_complex(self, duplicate_validator):
         """Test complex driver-vehicle validation scenarios."""
         allocations = {
@@ -618,8 +682,7 @@ class TestDuplicateVehicleValidator:
     # ==================== VehicleAssignment Tests ====================
 
     def test_vehicle_assignment_timestamp(self):
-        """Test VehicleAssignment timestamp functionality."""
-        before = datetime.now()
+        """Test VehicleAssignment timestamp defaults to unset."""
         assignment = VehicleAssignment(
             vehicle_id="BW1",
             route_code="CX1",
@@ -628,10 +691,27 @@ class TestDuplicateVehicleValidator:
             wave="8:00 AM",
             staging_location="STG.G.1",
         )
+
+        assert assignment.assignment_timestamp is None
+
+    def test_validation_stamps_batch_timestamp(self, duplicate_validator):
+        """Test all assignments from one validation share a single timestamp."""
+        allocations = [
+            {"Van ID": "BW1", "Route Code": "CX1"},
+            {"Van ID": "BW1", "Route Code": "CX2"},
+            {"Van ID": "BW2", "Route Code": "CX3"},
+            {"Van ID": "BW2", "Route Code": "CX4"},
+        ]
+
+        before = datetime.now()
+        result = duplicate_validator.validate_allocations(allocations)
         after = datetime.now()
 
-        # Timestamp should be between before and after
-        assert before <= assignment.assignment_timestamp <= after
+        timestamps = {
+            a.assignment_timestamp for d in result.duplicates.values() for a in d.assignments
+        }
+        assert len(timestamps) == 1
+        assert before <= timestamps.pop() <= after
 
     def test_vehicle_assignment_custom_timestamp(self):
         """Test VehicleAssignment with custom timestamp."""
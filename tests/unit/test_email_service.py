@@ -0,0 +1,547 @@
+"""Unit tests for EmailService SMTP delivery."""
+
+import base64
+import smtplib
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+from src.models import email as email_models
+from src.models.email import EmailMessage, EmailPriority, EmailRecipient, EmailTemplate
+from src.services import email_service as email_module
+from src.services.email_service import EmailService
+
+
+@pytest.fixture
+def smtp_mock(mocker):
+    """Patch smtplib.SMTP and return the mocked class."""
+    smtp_cls = mocker.patch("smtplib.SMTP")
+    smtp_cls.return_value.noop.return_value = (250, b"OK")
+    return smtp_cls
+
+
+@pytest.fixture
+def fake_clock(mocker):
+    """Patch time.monotonic with a clock that time.sleep advances; return the sleep mock."""
+    now = [1000.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+
+    def advance(seconds):
+        now[0] += seconds
+
+    return mocker.patch("time.sleep", side_effect=advance)
+
+
+@pytest.fixture
+def email_service():
+    """Create an enabled EmailService with credentials."""
+    return EmailService(
+        config={
+            "email_enabled": True,
+            "smtp_host": "smtp.example.com",
+            "email_username": "user",
+            "email_password": "secret",
+            "default_recipients": ["ops@example.com"],
+        }
+    )
+
+
+def make_message(subject: str = "Test") -> EmailMessage:
+    """Build a minimal plain-text message."""
+    return EmailMessage(
+        subject=subject,
+        body="Body",
+        sender="noreply@example.com",
+        recipients=[EmailRecipient(email="ops@example.com")],
+    )
+
+
+class TestEmailService:
+    """Test cases for EmailService."""
+
+    def test_connection_reused_across_sends(self, email_service, smtp_mock):
+        """Test consecutive sends share one authenticated connection."""
+        assert email_service.send_email(make_message("One"))
+        assert email_service.send_email(make_message("Two"))
+
+        smtp_mock.assert_called_once()
+        smtp = smtp_mock.return_value
+        smtp.login.assert_called_once_with("user", "secret")
+        assert smtp.sendmail.call_count == 2
+
+    def test_reconnects_when_noop_fails(self, email_service, smtp_mock):
+        """Test a dead pooled connection is replaced on the next send."""
+        email_service.send_email(make_message())
+        smtp_mock.return_value.noop.side_effect = smtplib.SMTPServerDisconnected()
+
+        assert email_service.send_email(make_message())
+        assert smtp_mock.call_count == 2
+
+    def test_recycles_after_message_cap(self, smtp_mock):
+        """Test the connection is recycled once the per-connection cap is hit."""
+        service = EmailService(config={"email_enabled": True, "max_messages_per_connection": 2})
+
+        for _ in range(3):
+            assert service.send_email(make_message())
+
+        assert smtp_mock.call_count == 2
+        smtp_mock.return_value.quit.assert_called_once()
+
+    def test_send_email_async_returns_future(self, email_service, smtp_mock):
+        """Test async sends resolve to the send result off the calling thread."""
+        futures = [email_service.send_email_async(make_message(f"Async {i}")) for i in range(2)]
+
+        assert [future.result(timeout=5) for future in futures] == [True, True]
+        smtp_mock.assert_called_once()
+
+        email_service.cleanup()
+        assert email_service.executor is None
+
+    def test_enqueue_only_workers_use_own_connections(self, smtp_mock):
+        """Test enqueue-only mode sends on worker threads with their own connections."""
+        service = EmailService(
+            config={"email_enabled": True, "email_enqueue_only": True, "email_workers": 2}
+        )
+
+        futures = [service.send_email_async(make_message(f"Queued {i}")) for i in range(4)]
+
+        assert all(future.result(timeout=5) for future in futures)
+        assert service.smtp_connection is None  # shared session untouched
+        assert len(service._workers) == 2
+
+        service.cleanup()
+        assert service._workers == []
+        assert smtp_mock.return_value.quit.call_count == smtp_mock.call_count
+
+    def test_file_attachment_encoded_once(self, email_service, tmp_path, mocker):
+        """Test an unchanged file attachment is base64-encoded only once."""
+        email_module._clear_attachment_cache()
+        encode = mocker.spy(email_module, "_encode_base64")
+        report = tmp_path / "report.xlsx"
+        report.write_bytes(b"report-bytes" * 10)
+
+        for _ in range(2):
+            message = make_message()
+            message.add_attachment(report)
+            mime = email_service._create_mime_message(message)
+
+        encode.assert_called_once()
+        part = mime.get_payload()[-1]
+        assert part["Content-Transfer-Encoding"] == "base64"
+        assert part.get_payload(decode=True) == b"report-bytes" * 10
+
+    def test_attachment_cache_keeps_latest_version_per_file(self, tmp_path):
+        """Test a rewritten attachment replaces its cached encoding instead of adding one."""
+        email_module._clear_attachment_cache()
+        report = tmp_path / "report.xlsx"
+
+        for version in range(3):
+            report.write_bytes(b"v%d" % version * 100)
+            stat = report.stat()
+            encoded = email_module._encoded_attachment(
+                str(report), stat.st_mtime_ns + version, stat.st_size
+            )
+
+        assert list(email_module._attachment_cache) == [str(report)]
+        assert email_module._attachment_cache_chars == len(encoded)
+
+    def test_attachment_cache_is_capped_by_size(self, tmp_path, mocker):
+        """Test least recently used encodings are evicted and oversized ones never cached."""
+        email_module._clear_attachment_cache()
+        mocker.patch.object(email_module, "_ATTACHMENT_CACHE_MAX_CHARS", 300)
+        paths = []
+        for name, size in (("a", 100), ("b", 100), ("c", 100), ("big", 400)):
+            path = tmp_path / f"{name}.bin"
+            path.write_bytes(b"x" * size)
+            paths.append(path)
+
+        for path in paths:
+            stat = path.stat()
+            email_module._encoded_attachment(str(path), stat.st_mtime_ns, stat.st_size)
+
+        # 100 bytes encode to 138 characters, so only the two most recent fit
+        assert list(email_module._attachment_cache) == [str(paths[1]), str(paths[2])]
+        assert email_module._attachment_cache_chars == 276
+        email_module._clear_attachment_cache()
+
+    def test_retry_reuses_cached_mime_bytes(self, email_service, smtp_mock, mocker):
+        """Test a retried message is sent from its cached MIME bytes."""
+        create = mocker.spy(email_service, "_create_mime_message")
+        smtp_mock.return_value.sendmail.side_effect = [smtplib.SMTPDataError(451, b"Later"), {}]
+        message = make_message()
+
+        assert not email_service.send_email(message)
+        assert email_service.send_many([message]) == (1, 0)
+
+        create.assert_called_once()
+        first, second = smtp_mock.return_value.sendmail.call_args_list
+        assert first.args[2] == second.args[2]
+        assert first.args[2].endswith(b"\r\n")
+
+    def test_port_465_uses_implicit_tls(self, smtp_mock, mocker):
+        """Test port 465 connects with SMTP_SSL and skips STARTTLS."""
+        smtp_ssl = mocker.patch("smtplib.SMTP_SSL")
+        service = EmailService(config={"email_enabled": True, "smtp_port": 465})
+
+        assert service.send_email(make_message())
+
+        smtp_mock.assert_not_called()
+        smtp_ssl.assert_called_once()
+        smtp_ssl.return_value.starttls.assert_not_called()
+
+    def test_port_587_uses_starttls(self, email_service, smtp_mock):
+        """Test the default port upgrades the plain connection with STARTTLS."""
+        assert email_service.send_email(make_message())
+
+        smtp_mock.return_value.starttls.assert_called_once()
+
+    def test_allocation_notification_dedupes_recipients(self, mocker):
+        """Test duplicate To addresses and CCs already in To are dropped."""
+        service = EmailService(config={"email_enabled": True})
+        service.email_config.cc_recipients = ["b@example.com", "c@example.com"]
+        send = mocker.patch.object(service, "send_email", return_value=True)
+        result = mocker.Mock()
+        result.get_allocation_summary.return_value = {
+            "timestamp": datetime(2024, 1, 1),
+            "total_allocated_vehicles": 1,
+            "total_unallocated_vehicles": 0,
+            "total_drivers": 1,
+            "allocation_rate": 1.0,
+        }
+
+        assert service.send_allocation_notification(
+            result, recipients=["a@example.com", "b@example.com", "a@example.com"]
+        )
+
+        message = send.call_args.args[0]
+        assert message.subject == "Resource Allocation Completed - 2024-01-01"
+        assert [(str(r.email), r.recipient_type) for r in message.recipients] == [
+            ("a@example.com", "to"),
+            ("b@example.com", "to"),
+            ("c@example.com", "cc"),
+        ]
+
+    def test_error_notification_builds_valid_message(self, email_service, mocker):
+        """Test error notifications reach send_email with deduplicated recipients."""
+        send = mocker.patch.object(email_service, "send_email", return_value=True)
+
+        assert email_service.send_error_notification(
+            "Boom", recipients=["a@example.com", "a@example.com"]
+        )
+
+        message = send.call_args.args[0]
+        assert [str(r.email) for r in message.recipients] == ["a@example.com"]
+
+    def test_error_notification_enqueue_only_skips_send(self, mocker):
+        """Test enqueue-only mode hands error notifications to the workers."""
+        service = EmailService(config={"email_enabled": True, "email_enqueue_only": True})
+        send = mocker.patch.object(service, "send_email")
+        enqueue = mocker.patch.object(service, "enqueue_email")
+
+        assert service.send_error_notification("Boom", recipients=["a@example.com"])
+
+        send.assert_not_called()
+        message = enqueue.call_args.args[0]
+        assert message.priority == EmailPriority.HIGH
+        assert message.subject.startswith("Resource Allocation Error - ")
+
+    def test_notification_programming_errors_propagate(self, email_service, mocker):
+        """Test unexpected errors surface instead of being logged as send failures."""
+        result = mocker.Mock()
+        result.get_allocation_summary.side_effect = AttributeError("bug")
+
+        with pytest.raises(AttributeError):
+            email_service.send_allocation_notification(result)
+
+    def test_mime_headers(self, email_service):
+        """Test From and priority headers for default and custom senders."""
+        default = make_message()
+        default.sender = email_service.email_config.from_email
+        default.priority = EmailPriority.URGENT
+        custom = make_message()
+        custom.sender_name = "Ops Bot"
+
+        default_mime = email_service._create_mime_message(default)
+        custom_mime = email_service._create_mime_message(custom)
+
+        assert default_mime["From"] == (
+            "Resource Management System <noreply@resourceallocation.com>"
+        )
+        assert default_mime["X-Priority"] == "1"
+        assert default_mime["Importance"] == "high"
+        assert custom_mime["From"] == "Ops Bot <noreply@example.com>"
+        assert custom_mime["X-Priority"] is None
+
+    def test_skips_starttls_and_login_when_not_offered(self, smtp_mock):
+        """Test a relay advertising neither STARTTLS nor AUTH gets neither."""
+        smtp_mock.return_value.has_extn.return_value = False
+        service = EmailService(config={"email_enabled": True})
+
+        assert service.send_email(make_message())
+
+        smtp_mock.return_value.starttls.assert_not_called()
+        smtp_mock.return_value.login.assert_not_called()
+
+    def test_refuses_cleartext_login_without_starttls(self, email_service, smtp_mock):
+        """Test credentials are not sent when STARTTLS is required but not offered."""
+        smtp_mock.return_value.has_extn.side_effect = lambda name: name == "auth"
+
+        assert not email_service.send_email(make_message())
+
+        smtp_mock.return_value.login.assert_not_called()
+
+    def test_import_does_not_load_smtp_modules(self):
+        """Test importing the service leaves smtplib and email.mime unloaded."""
+        code = (
+            "import sys; import src.services.email_service; "
+            "sys.exit(any(m in sys.modules for m in ('smtplib', 'email.mime.text')))"
+        )
+
+        assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+    @pytest.mark.parametrize("size", [0, 1, 57, 58, 1000])
+    def test_encode_base64_matches_stdlib(self, size):
+        """Test chunked encoding matches base64.encodebytes line for line."""
+        data = bytes(range(256)) * 4
+
+        assert email_module._encode_base64(data[:size]) == (
+            base64.encodebytes(data[:size]).decode("ascii")
+        )
+
+    def test_relay_failover_and_cooldown(self, smtp_mock):
+        """Test a failing relay is skipped for new connections while cooling down."""
+        connected = []
+
+        def connect(host, *_args, **_kwargs):
+            if host == "relay-a":
+                raise ConnectionRefusedError("down")
+            connected.append(host)
+            return smtp_mock.return_value
+
+        smtp_mock.side_effect = connect
+        service = EmailService(
+            config={"email_enabled": True, "smtp_hosts": ["relay-a", "relay-b", "relay-c"]}
+        )
+
+        assert service.send_email(make_message())
+        assert service._session.host == "relay-b"
+
+        # New connections rotate across relays without retrying relay-a
+        for _ in range(3):
+            with service._smtp_lock:
+                service._close_connection()
+                service._get_connection()
+
+        assert connected == ["relay-b", "relay-b", "relay-c", "relay-b"]
+        assert "relay-a" in service._host_cooldowns
+
+    def test_cleanup_quits_pooled_connection(self, email_service, smtp_mock):
+        """Test cleanup closes the pooled connection."""
+        email_service.send_email(make_message())
+        email_service.cleanup()
+
+        smtp_mock.return_value.quit.assert_called_once()
+        assert email_service.smtp_connection is None
+
+    def test_process_queue_sends_batch_without_sleeping(self, email_service, smtp_mock, mocker):
+        """Test queued messages go out back-to-back over one connection."""
+        sleep = mocker.patch("time.sleep")
+        for i in range(3):
+            email_service.queue_email(make_message(f"Queued {i}"))
+
+        assert email_service.process_queue() == (3, 0)
+
+        sleep.assert_not_called()
+        smtp_mock.assert_called_once()
+        smtp_mock.return_value.noop.assert_not_called()
+        assert smtp_mock.return_value.sendmail.call_count == 3
+        assert email_service.queue == []
+
+    def test_send_many_requeues_failed_message(self, email_service, smtp_mock):
+        """Test a failed message in a batch is re-queued while the rest are sent."""
+        smtp_mock.return_value.sendmail.side_effect = [
+            None,
+            smtplib.SMTPRecipientsRefused({}),
+            None,
+        ]
+        messages = [make_message(f"Batch {i}") for i in range(3)]
+
+        assert email_service.send_many(messages) == (2, 1)
+        assert [entry[2] for entry in email_service.queue] == [messages[1]]
+        assert messages[1].retry_count == 1
+
+    def test_rejected_message_keeps_connection_and_relay(self, email_service, smtp_mock):
+        """Test a per-message SMTP rejection does not drop the connection or mark the relay down."""
+        smtp_mock.return_value.sendmail.side_effect = [smtplib.SMTPRecipientsRefused({}), None]
+
+        assert not email_service.send_email(make_message("Rejected"))
+        assert email_service.smtp_connection is smtp_mock.return_value
+        assert email_service._host_cooldowns == {}
+
+        assert email_service.send_email(make_message("Accepted"))
+        smtp_mock.assert_called_once()
+
+    def test_disconnect_during_send_drops_connection(self, email_service, smtp_mock):
+        """Test a dropped connection mid-send closes it and cools the relay down."""
+        smtp_mock.return_value.sendmail.side_effect = smtplib.SMTPServerDisconnected("gone")
+
+        assert not email_service.send_email(make_message())
+        assert email_service.smtp_connection is None
+        assert email_service.email_config.smtp_host in email_service._host_cooldowns
+
+    def test_authentication_error_does_not_fail_over(self, smtp_mock):
+        """Test bad credentials are raised instead of trying the next relay."""
+        smtp_mock.return_value.login.side_effect = smtplib.SMTPAuthenticationError(535, b"no")
+        service = EmailService(
+            config={
+                "email_enabled": True,
+                "smtp_hosts": ["relay-a", "relay-b"],
+                "email_username": "user",
+                "email_password": "secret",
+            }
+        )
+
+        with service._smtp_lock, pytest.raises(smtplib.SMTPAuthenticationError):
+            service._get_connection()
+
+        smtp_mock.assert_called_once()
+        assert service._host_cooldowns == {}
+
+    def test_process_queue_sleeps_only_until_retry_is_due(
+        self, email_service, smtp_mock, fake_clock
+    ):
+        """Test fresh messages go out first and the loop sleeps only for the retry."""
+        retry = make_message("Retry")
+        retry.retry_count = 1
+        fresh = make_message("Fresh")
+        email_service.queue_email(retry)
+        email_service.queue_email(fresh)
+
+        assert email_service.process_queue() == (2, 0)
+
+        naps = [call.args[0] for call in fake_clock.call_args_list]
+        assert max(naps) <= 1.0
+        assert sum(naps) == pytest.approx(email_service.email_config.retry_delay)
+        bodies = [call.args[2] for call in smtp_mock.return_value.sendmail.call_args_list]
+        assert [b"Subject: Fresh" in body for body in bodies] == [True, False]
+        assert b"Subject: Retry" in bodies[1]
+
+    def test_retry_backoff_doubles_up_to_cap(self, fake_clock):
+        """Test retries back off exponentially and are capped at max_retry_delay."""
+        service = EmailService(config={"retry_delay": 60, "max_retry_delay": 200})
+        delays = []
+        for retry_count in range(4):
+            message = make_message()
+            message.retry_count = retry_count
+            service.queue_email(message)
+            delays.append(message.next_attempt_at - 1000.0)
+
+        assert delays == [0, 60, 120, 200]
+        fake_clock.assert_not_called()
+
+
+class TestEmailMessage:
+    """Test cases for EmailMessage recipients."""
+
+    def test_add_recipients_extends_in_one_call(self):
+        """Test bulk-added recipients keep order and type."""
+        message = make_message()
+
+        message.add_recipients(["a@example.com", "b@example.com"], recipient_type="cc")
+
+        assert [(str(r.email), r.recipient_type) for r in message.recipients[1:]] == [
+            ("a@example.com", "cc"),
+            ("b@example.com", "cc"),
+        ]
+
+
+class TestEmailTemplate:
+    """Test cases for EmailTemplate rendering."""
+
+    @pytest.fixture
+    def template(self):
+        """Create a template with text and HTML bodies."""
+        return EmailTemplate(
+            template_id="greeting",
+            name="Greeting",
+            subject_template="Hello {{name}}",
+            body_template="Dear {{name}},\n",
+            body_html_template="<p>{{name}}</p>",
+        )
+
+    def test_compiled_templates_substitute_variables(self, template):
+        """Test variables are filled in and only the HTML part is escaped."""
+        pytest.importorskip("jinja2")
+        variables = {"name": "A & B"}
+
+        assert template._get_compiled(template.subject_template).render(variables) == (
+            "Hello A & B"
+        )
+        assert template._get_compiled(template.body_template).render(variables) == ("Dear A & B,\n")
+        html = template._get_compiled(template.body_html_template, is_html=True)
+        assert html.render(variables) == "<p>A &amp; B</p>"
+
+    def test_compile_caches_templates(self, template, mocker):
+        """Test templates are compiled once and reused afterwards."""
+        pytest.importorskip("jinja2")
+        get_template = mocker.spy(email_models._TEXT_ENV, "get_template")
+
+        template.compile()
+        template.compile()
+        template._get_compiled(template.subject_template)
+
+        assert get_template.call_count == 2  # subject and plain-text body
+
+    def test_compile_without_jinja2(self, template, monkeypatch):
+        """Test compile is a no-op when Jinja2 is unavailable."""
+        monkeypatch.setattr(email_models, "JINJA2_AVAILABLE", False)
+
+        template.compile()
+
+        assert template._compiled == {}
+
+    def test_bytecode_cache_uses_app_cache_dir(self, tmp_path, monkeypatch):
+        """Test the bytecode cache lives in the app cache directory, created on demand."""
+        pytest.importorskip("jinja2")
+        cache_dir = tmp_path / ".cache" / "jinja2"
+        monkeypatch.setattr(email_models, "_BYTECODE_CACHE_DIR", cache_dir)
+
+        env = email_models._make_jinja_env(autoescape=False)
+
+        assert cache_dir.is_dir()
+        assert env.bytecode_cache.directory == str(cache_dir)
+
+    @pytest.mark.parametrize(
+        "error", [RuntimeError("Cannot determine safe temp directory"), PermissionError()]
+    )
+    def test_unusable_bytecode_cache_falls_back(self, tmp_path, monkeypatch, mocker, error):
+        """Test an unusable cache directory leaves templates compiled in memory only."""
+        pytest.importorskip("jinja2")
+        monkeypatch.setattr(email_models, "_BYTECODE_CACHE_DIR", tmp_path / "jinja2")
+        mocker.patch.object(email_models, "FileSystemBytecodeCache", side_effect=error)
+
+        env = email_models._make_jinja_env(autoescape=True)
+
+        assert env.bytecode_cache is None
+        assert env.get_template("Hi {{ name }}").render(name="<b>") == "Hi &lt;b&gt;"
+
+    def test_compiled_bytecode_is_persisted(self, template, tmp_path, monkeypatch, mocker):
+        """Test compiled bytecode is written once and reused instead of recompiling."""
+        jinja2 = pytest.importorskip("jinja2")
+        env = email_models._make_jinja_env(autoescape=False)
+        env.bytecode_cache = jinja2.FileSystemBytecodeCache(str(tmp_path))
+        monkeypatch.setattr(email_models, "_TEXT_ENV", env)
+
+        template.compile()
+        assert len(list(tmp_path.iterdir())) == 2
+
+        # Simulate a restart: empty in-memory caches, bytecode stays on disk
+        env.cache.clear()
+        compile_spy = mocker.spy(env, "compile")
+        fresh = template.model_copy()
+        fresh._compiled = {}
+        fresh.compile()
+
+        compile_spy.assert_not_called()
@@ -0,0 +1,106 @@
+"""Unit tests for the shared Excel sheet cache."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.services import _excel_cache
+from src.services.dashboard_data_service import DashboardDataService
+from src.services.data_management_service import DataManagementService
+
+
+@pytest.fixture
+def summary_log(tmp_path):
+    """Create a minimal Daily Summary Log with a Vehicle Status sheet."""
+    path = tmp_path / "Daily Summary Log.xlsx"
+    pd.DataFrame({"Van ID": ["BW1", "BW2", "BW3"], "Opnal? Y/N": ["Y", "Y", "N"]}).to_excel(
+        path, sheet_name="Vehicle Status", index=False
+    )
+    _excel_cache.clear()
+    yield path
+    _excel_cache.clear()
+
+
+class TestExcelCache:
+    """Test cases for get_sheet_df."""
+
+    def test_services_share_parsed_sheet(self, summary_log, mocker):
+        """Both services reuse a single parse of the same workbook."""
+        spy = mocker.spy(pd.ExcelFile, "parse")
+
+        df = DataManagementService().load_vehicle_status(str(summary_log))
+        count = DashboardDataService().total_operational_vehicles(str(summary_log))
+
+        assert len(df) == 3
+        assert count == 2
+        assert spy.call_count == 1
+
+    def test_reparses_when_file_changes(self, summary_log):
+        """A new mtime invalidates the cached workbook and sheets."""
+        first = _excel_cache.get_sheet_df(summary_log, "Vehicle Status")
+        assert _excel_cache.get_sheet_df(summary_log, "Vehicle Status") is first
+
+        pd.DataFrame({"Van ID": ["BW9"], "Opnal? Y/N": ["Y"]}).to_excel(
+            summary_log, sheet_name="Vehicle Status", index=False
+        )
+        stat = summary_log.stat()
+        os.utime(summary_log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = _excel_cache.get_sheet_df(summary_log, "Vehicle Status")
+        assert second is not first
+        assert second["Van ID"].tolist() == ["BW9"]
+
+    def test_missing_sheet_raises(self, summary_log):
+        """Unknown sheet names propagate the reader error."""
+        with pytest.raises(ValueError):
+            _excel_cache.get_sheet_df(summary_log, "Nope")
+
+    def test_second_sheet_reuses_open_workbook(self, summary_log, mocker):
+        """Reading another sheet of the same file doesn't reopen the workbook."""
+        with pd.ExcelWriter(summary_log) as writer:
+            pd.DataFrame({"Van ID": ["BW1"]}).to_excel(
+                writer, sheet_name="Vehicle Status", index=False
+            )
+            pd.DataFrame({"Van ID": ["BW2"]}).to_excel(
+                writer, sheet_name="Vehicle Log", index=False
+            )
+        opened = mocker.spy(pd, "ExcelFile")
+
+        status = _excel_cache.get_sheet_df(summary_log, "Vehicle Status")
+        log = _excel_cache.get_sheet_df(summary_log, "Vehicle Log")
+
+        assert opened.call_count == 1
+        assert status["Van ID"].tolist() == ["BW1"]
+        assert log["Van ID"].tolist() == ["BW2"]
+
+    @pytest.mark.usefixtures("summary_log")
+    def test_cache_is_bounded(self, tmp_path, mocker):
+        """Only one open workbook and a bounded number of paths are kept."""
+        mocker.patch.object(_excel_cache, "_MAX_PATHS", 2)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"Daily Routes {i}.xlsx"
+            pd.DataFrame({"Route": [i]}).to_excel(path, sheet_name="Routes", index=False)
+            paths.append(path)
+
+        for path in paths:
+            _excel_cache.get_sheet_df(path, "Routes")
+
+        assert list(_excel_cache._sheets) == [str(paths[1]), str(paths[2])]
+        assert _excel_cache._book[0] == str(paths[2])
+
+    def test_parse_runs_outside_lock(self, summary_log, mocker):
+        """Parsing a workbook doesn't block cache reads of other files."""
+        parse = pd.ExcelFile.parse
+        held = []
+
+        def checked_parse(book, *args, **kwargs):
+            held.append(_excel_cache._lock.locked())
+            return parse(book, *args, **kwargs)
+
+        mocker.patch.object(pd.ExcelFile, "parse", checked_parse)
+
+        _excel_cache.get_sheet_df(summary_log, "Vehicle Status")
+
+        assert held == [False]
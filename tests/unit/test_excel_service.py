@@ -0,0 +1,420 @@
+"""Unit tests for ExcelService openpyxl writing."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Border, Side
+
+from src.models.allocation import AllocationResult
+from src.models.excel import (
+    ExcelAlignment,
+    ExcelColor,
+    ExcelFill,
+    ExcelFont,
+    ExcelRange,
+    ExcelStyle,
+)
+from src.services import excel_service as excel_module
+from src.services.excel_service import ExcelService
+
+
+@pytest.fixture
+def excel_service():
+    """Create an openpyxl-backed ExcelService with an open workbook."""
+    service = ExcelService(config={"use_xlwings": False})
+    service.create_workbook()
+    return service
+
+
+@pytest.fixture
+def sample_df():
+    """Create a small mixed-dtype DataFrame with missing values."""
+    return pd.DataFrame(
+        {
+            "Van ID": ["BW1", "BW2", None],
+            "Count": [1, 2, 3],
+            "Rate": [0.5, np.nan, 1.5],
+        }
+    )
+
+
+class TestExcelService:
+    """Test cases for ExcelService."""
+
+    def test_write_dataframe_to_empty_sheet(self, excel_service, sample_df):
+        """Test a DataFrame is written with headers and native values."""
+        excel_service.write_data("Sheet", sample_df)
+
+        sheet = excel_service.get_sheet("Sheet")
+        assert [list(row) for row in sheet.values] == [
+            ["Van ID", "Count", "Rate"],
+            ["BW1", 1, 0.5],
+            ["BW2", 2, None],
+            [None, 3, 1.5],
+        ]
+        assert type(sheet["B2"].value) is int
+
+    def test_write_dataframe_at_offset_keeps_neighbours(self, excel_service, sample_df):
+        """Test writing at an offset leaves cells outside the block untouched."""
+        sheet = excel_service.get_sheet("Sheet")
+        sheet["A3"] = "keep"
+
+        excel_service.write_data("Sheet", sample_df, start_row=2, start_col=2, headers=False)
+        excel_service.write_data("Sheet", sample_df.head(1), start_row=5, start_col=3)
+
+        assert sheet["A3"].value == "keep"
+        assert [sheet.cell(row=2, column=c).value for c in (2, 3, 4)] == ["BW1", 1, 0.5]
+        assert [sheet.cell(row=5, column=c).value for c in (3, 4, 5)] == [
+            "Van ID",
+            "Count",
+            "Rate",
+        ]
+        assert sheet["B5"].value is None
+        assert [sheet.cell(row=6, column=c).value for c in (3, 4, 5)] == ["BW1", 1, 0.5]
+
+    def test_write_only_workbook_streams_rows(self, sample_df, tmp_path):
+        """Test bulk-export workbooks are write-only and keep block placement."""
+        service = ExcelService(config={"use_xlwings": False, "bulk_export": True})
+        service.create_workbook()
+        service.create_sheet("Export")
+
+        service.write_data("Export", sample_df, start_row=2, start_col=2)
+        service.write_data("Export", {"Total": 3}, start_row=7)
+        with pytest.raises(ValueError):
+            service.write_data("Export", [["too late"]], start_row=3)
+
+        path = tmp_path / "export.xlsx"
+        service.save_workbook(str(path))
+
+        sheet = load_workbook(path)["Export"]
+        assert [list(row) for row in sheet.iter_rows(values_only=True)] == [
+            [None, None, None, None],
+            [None, "Van ID", "Count", "Rate"],
+            [None, "BW1", 1, 0.5],
+            [None, "BW2", 2, None],
+            [None, None, 3, 1.5],
+            [None, None, None, None],
+            ["Total", 3, None, None],
+        ]
+
+    def test_export_allocation_result(self, tmp_path, mocker):
+        """Test allocation results export through a write-only workbook."""
+        service = ExcelService(config={"use_xlwings": False})
+        result = AllocationResult(
+            request_id="r1",
+            allocations={"D1": ["V1", "V2"]},
+            unallocated_vehicles=["V3"],
+        )
+        path = tmp_path / "allocations.xlsx"
+
+        write_only = mocker.spy(excel_module, "Workbook")
+        service.export_allocation_result(str(path), result)
+
+        write_only.assert_called_once_with(write_only=True)
+        assert service.workbook is None
+        rows = list(load_workbook(path)["Allocations"].iter_rows(values_only=True))
+        assert [row[:3] for row in rows] == [
+            ("Driver ID", "Vehicle ID", "Status"),
+            ("D1", "V1", "Allocated"),
+            ("D1", "V2", "Allocated"),
+            ("Unallocated", "V3", "Unallocated"),
+        ]
+
+    def test_export_allocation_results_saves_once(self, tmp_path, mocker):
+        """Test several results are written to their own sheets in one save."""
+        service = ExcelService(config={"use_xlwings": False})
+        first = AllocationResult(
+            request_id="r1", allocations={"D1": ["V1"]}, unallocated_vehicles=[]
+        )
+        second = AllocationResult(request_id="r2", allocations={}, unallocated_vehicles=["V2"])
+        path = tmp_path / "allocations.xlsx"
+
+        save = mocker.spy(service, "save_workbook")
+        service.export_allocation_results(str(path), [("Morning", first), ("Evening", second)])
+
+        save.assert_called_once_with(str(path))
+        book = load_workbook(path)
+        assert book.sheetnames == ["Morning", "Evening"]
+        assert book["Morning"]["B2"].value == "V1"
+        assert book["Evening"]["A2"].value == "Unallocated"
+
+    def test_export_allocation_result_bypasses_xlwings(self, tmp_path, mocker):
+        """Test exports use openpyxl and leave the open xlwings workbook in place."""
+        service = ExcelService(config={"use_xlwings": True})
+        book = mocker.Mock()
+        service.workbook = book
+        result = AllocationResult(
+            request_id="r1", allocations={"D1": ["V1"]}, unallocated_vehicles=[]
+        )
+        path = tmp_path / "allocations.xlsx"
+
+        service.export_allocation_result(str(path), result)
+
+        assert service.use_xlwings is True
+        assert service.workbook is book
+        book.save.assert_not_called()
+        assert load_workbook(path)["Allocations"]["B2"].value == "V1"
+
+    def test_export_allocation_result_with_xlsxwriter(self, tmp_path):
+        """Test the xlsxwriter export engine writes the same rows and timestamps."""
+        pytest.importorskip("xlsxwriter")
+        service = ExcelService(config={"use_xlwings": False, "export_engine": "xlsxwriter"})
+        # Whole seconds, since sub-second precision can round in the saved file
+        timestamp = datetime(2026, 1, 15, 9, 30, 45)
+        result = AllocationResult(
+            request_id="r1",
+            allocations={"D1": ["V1"]},
+            unallocated_vehicles=["V2"],
+            timestamp=timestamp,
+        )
+        path = tmp_path / "allocations.xlsx"
+
+        service.export_allocation_result(str(path), result)
+
+        assert service.workbook is None
+        rows = list(load_workbook(path)["Allocations"].iter_rows(values_only=True))
+        assert rows[0] == ("Driver ID", "Vehicle ID", "Status", "Timestamp")
+        assert [row[:3] for row in rows[1:]] == [
+            ("D1", "V1", "Allocated"),
+            ("Unallocated", "V2", "Unallocated"),
+        ]
+        assert rows[1][3] == timestamp
+
+    def test_xlwings_dict_and_list_written_in_one_call(self, excel_service, mocker):
+        """Test xlwings writes each dict/list block with a single range assignment."""
+        excel_service.use_xlwings = True
+        sheet = mocker.Mock()
+
+        excel_service._write_dict(sheet, {"A": 1, "B": 2}, 2, 3)
+        sheet.range.assert_called_once_with((2, 3))
+        assert sheet.range.return_value.value == [["A", 1], ["B", 2]]
+
+        sheet.reset_mock()
+        excel_service._write_list(sheet, ["x", ["y", "z"]], 1, 1)
+        sheet.range.assert_called_once_with((1, 1))
+        assert sheet.range.return_value.value == [["x", None], ["y", "z"]]
+
+    def test_apply_style_builds_style_objects_once(self, excel_service, mocker):
+        """Test a range is styled with one shared Font/Alignment/PatternFill each."""
+        font_cls = mocker.spy(excel_module, "Font")
+        style = ExcelStyle(
+            font=ExcelFont(bold=True, color=ExcelColor(rgb="FF0000")),
+            alignment=ExcelAlignment(horizontal="center"),
+            fill=ExcelFill(fg_color=ExcelColor(rgb="00FF00")),
+            number_format="0.00",
+        )
+        excel_range = ExcelRange(sheet_name="Sheet", start_row=1, start_col=1, end_row=3, end_col=2)
+
+        excel_service.apply_style(excel_range, style)
+
+        font_cls.assert_called_once()
+        sheet = excel_service.get_sheet("Sheet")
+        for row in sheet["A1:B3"]:
+            for cell in row:
+                assert cell.font.b
+                assert cell.font.color.rgb == "00FF0000"
+                assert cell.alignment.horizontal == "center"
+                assert cell.fill.fgColor.rgb == "0000FF00"
+                assert cell.number_format == "0.00"
+
+    def test_apply_style_keeps_existing_cell_formatting(self, excel_service):
+        """Test cells with different starting styles keep their own untouched attributes."""
+        sheet = excel_service.get_sheet("Sheet")
+        sheet["B2"].border = Border(left=Side(style="thin"))
+        style = ExcelStyle(font=ExcelFont(bold=True))
+        excel_range = ExcelRange(sheet_name="Sheet", start_row=1, start_col=1, end_row=3, end_col=3)
+
+        excel_service.apply_style(excel_range, style)
+
+        assert all(cell.font.b for row in sheet["A1:C3"] for cell in row)
+        assert sheet["B2"].border.left.style == "thin"
+        assert sheet["A1"].border.left.style is None
+        assert sheet["C3"].border.left.style is None
+
+    def test_get_sheet_caches_until_workbook_changes(self, excel_service, mocker):
+        """Test sheet lookups are cached per workbook."""
+        getitem = mocker.spy(type(excel_service.workbook), "__getitem__")
+
+        first = excel_service.get_sheet("Sheet")
+        assert excel_service.get_sheet("Sheet") is first
+        assert getitem.call_count == 1
+
+        created = excel_service.create_sheet("Data")
+        assert excel_service.get_sheet("Data") is created
+        assert getitem.call_count == 1
+
+        excel_service.create_workbook()
+        assert excel_service.get_sheet("Sheet") is not first
+        assert getitem.call_count == 2
+
+    def test_write_allocation_result_skips_dataframe(self, excel_service, mocker):
+        """Test allocation rows are written directly below the requested start row."""
+        frame = mocker.spy(excel_module.pd, "DataFrame")
+        result = AllocationResult(
+            request_id="r1", allocations={"D1": ["V1"]}, unallocated_vehicles=["V2"]
+        )
+
+        excel_service.write_allocation_result("Sheet", result, start_row=3)
+
+        frame.assert_not_called()
+        sheet = excel_service.get_sheet("Sheet")
+        assert list(sheet.iter_rows(min_row=3, max_col=3, values_only=True)) == [
+            ("Driver ID", "Vehicle ID", "Status"),
+            ("D1", "V1", "Allocated"),
+            ("Unallocated", "V2", "Unallocated"),
+        ]
+        assert sheet["D4"].value == result.timestamp
+
+    def test_write_allocation_result_xlwings_keeps_dataframe_layout(self, excel_service, mocker):
+        """Test xlwings still receives a DataFrame, so its index column is written first."""
+        excel_service.use_xlwings = True
+        sheet = mocker.Mock()
+        mocker.patch.object(excel_service, "get_sheet", return_value=sheet)
+        result = AllocationResult(
+            request_id="r1", allocations={"D1": ["V1"]}, unallocated_vehicles=["V2"]
+        )
+
+        excel_service.write_allocation_result("Sheet", result, start_row=3)
+
+        sheet.range.assert_called_once_with((3, 1))
+        frame = sheet.range.return_value.value
+        assert isinstance(frame, pd.DataFrame)
+        assert list(frame.columns) == ["Driver ID", "Vehicle ID", "Status", "Timestamp"]
+        assert frame[["Driver ID", "Vehicle ID", "Status"]].values.tolist() == [
+            ["D1", "V1", "Allocated"],
+            ["Unallocated", "V2", "Unallocated"],
+        ]
+
+    @pytest.mark.parametrize("allocations", [{}, {"D1": []}])
+    def test_write_allocation_result_empty_writes_nothing(self, excel_service, mocker, allocations):
+        """Test an empty result writes no header or rows with either backend."""
+        result = AllocationResult(request_id="r1", allocations=allocations, unallocated_vehicles=[])
+
+        excel_service.write_allocation_result("Sheet", result, start_row=3)
+
+        sheet = excel_service.get_sheet("Sheet")
+        assert sheet.max_row == 1
+        assert sheet["A1"].value is None
+
+        excel_service.use_xlwings = True
+        xlwings_sheet = mocker.Mock()
+        mocker.patch.object(excel_service, "get_sheet", return_value=xlwings_sheet)
+        excel_service.write_allocation_result("Sheet", result)
+        xlwings_sheet.range.assert_not_called()
+
+    def test_export_empty_allocation_result_matches_engines(self, tmp_path):
+        """Test both export engines leave an empty result's sheet blank."""
+        pytest.importorskip("xlsxwriter")
+        result = AllocationResult(request_id="r1", allocations={}, unallocated_vehicles=[])
+
+        for engine in ("openpyxl", "xlsxwriter"):
+            service = ExcelService(config={"use_xlwings": False, "export_engine": engine})
+            path = tmp_path / f"{engine}.xlsx"
+
+            service.export_allocation_result(str(path), result)
+
+            sheet = load_workbook(path)["Allocations"]
+            assert list(sheet.iter_rows(values_only=True)) in ([], [(None,)])
+
+    def test_read_data_empty_row_rule_matches_for_both_types(self, excel_service):
+        """Test rows of blanks, empty strings or zeros are skipped as frames and as lists."""
+        sheet = excel_service.get_sheet("Sheet")
+        sheet.append(["id", "name"])
+        sheet.append([1, "a"])
+        sheet.append([0, ""])
+        sheet.append([None, ""])
+        sheet.append([2, "b"])
+
+        df = excel_service.read_data("Sheet")
+        rows = excel_service.read_data("Sheet", as_dataframe=False)
+
+        assert df.to_dict("list") == {"id": [1, 2], "name": ["a", "b"]}
+        assert df["id"].dtype == "int64"
+        assert rows == [["id", "name"], [1, "a"], [2, "b"]]
+
+    def test_template_existence_is_checked_on_each_use(self, tmp_path):
+        """Test a template created or removed after a first check is seen on the next one."""
+        template = tmp_path / "template.xlsx"
+        service = ExcelService(config={"use_xlwings": False, "template_path": str(template)})
+        assert not service.validate()
+
+        book = Workbook()
+        book.active["A1"] = "from template"
+        book.save(template)
+        assert service.validate()
+        assert service.create_workbook(str(template)).active["A1"].value == "from template"
+
+        template.unlink()
+        assert not service.validate()
+        assert service.create_workbook(str(template)).active["A1"].value is None
+
+    def test_xlwings_style_sets_com_font_directly(self, excel_service, mocker):
+        """Test xlwings styling writes the COM Font object with a BGR color."""
+        sheet = mocker.Mock()
+        style = ExcelStyle(font=ExcelFont(bold=True, color=ExcelColor(rgb="112233")))
+        excel_range = ExcelRange(sheet_name="Sheet", start_row=1, start_col=1, end_row=2, end_col=2)
+
+        excel_service._apply_style_xlwings(sheet, excel_range, style)
+
+        api = sheet.range.return_value.api
+        assert api.Font.Bold is True
+        assert api.Font.Color == 0x332211
+        assert api.NumberFormat == "General"
+
+    def test_read_data_drops_empty_rows(self, excel_service):
+        """Test whole-sheet reads skip empty rows around and inside the data."""
+        sheet = excel_service.get_sheet("Sheet")
+        sheet.append([])
+        sheet.append(["id", "name"])
+        sheet.append([1, "a"])
+        sheet.append([])
+        sheet.append([2, "b"])
+
+        df = excel_service.read_data("Sheet")
+
+        assert list(df.columns) == ["id", "name"]
+        assert df.to_dict("list") == {"id": [1, 2], "name": ["a", "b"]}
+        assert df["id"].dtype == "int64"
+        assert excel_service.read_data("Sheet", as_dataframe=False) == [
+            ["id", "name"],
+            [1, "a"],
+            [2, "b"],
+        ]
+
+    def test_save_workbook_non_blocking(self, excel_service, tmp_path):
+        """Test non-blocking saves return a Future and finish before cleanup returns."""
+        excel_service.write_data("Sheet", [["a", 1]])
+        path = tmp_path / "out.xlsx"
+
+        future = excel_service.save_workbook(str(path), blocking=False)
+        excel_service.create_workbook()
+        excel_service.cleanup()
+
+        assert future.done()
+        assert future.result() is None
+        assert load_workbook(path)["Sheet"]["A1"].value == "a"
+
+    def test_session_opens_once_and_saves_on_exit(self, tmp_path):
+        """Test a session keeps one workbook open and saves it when the block ends."""
+        service = ExcelService(config={"use_xlwings": False})
+        path = tmp_path / "session.xlsx"
+
+        with service.session(str(path)) as excel:
+            excel.write_data("Sheet", [["first"]])
+            excel.flush()
+            workbook = excel.workbook
+            excel.write_data("Sheet", [["second"]], start_row=2)
+            assert excel.workbook is workbook
+
+        assert service.workbook is None
+        sheet = load_workbook(path)["Sheet"]
+        assert [sheet["A1"].value, sheet["A2"].value] == ["first", "second"]
+
+        with pytest.raises(RuntimeError), service.session(str(path)) as excel:
+            excel.write_data("Sheet", [["discarded"]], start_row=3)
+            raise RuntimeError("boom")
+
+        assert load_workbook(path)["Sheet"]["A3"].value is None
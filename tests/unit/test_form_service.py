@@ -0,0 +1,265 @@
+"""Unit tests for FormService workbook creation."""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.services.excel_service import ExcelService
+from src.services.form_service import ExcelForm, FormField, FormService
+
+
+@pytest.fixture
+def xlsxwriter_form_service():
+    """Create a FormService using the xlsxwriter engine with the default forms loaded."""
+    pytest.importorskip("xlsxwriter")
+    service = FormService(config={"export_engine": "xlsxwriter"})
+    service._load_default_forms()
+    return service
+
+
+@pytest.fixture
+def form_service():
+    """Create an openpyxl-backed FormService with the default forms loaded."""
+    service = FormService(config={"export_engine": "openpyxl"})
+    service.excel_service = ExcelService(config={"use_xlwings": False})
+    service._load_default_forms()
+    return service
+
+
+def validations_by_cell(ws) -> dict:
+    """Map each validated cell reference to its DataValidation."""
+    return {str(dv.sqref): dv for dv in ws.data_validations.dataValidation}
+
+
+class TestFormService:
+    """Test suite for FormService."""
+
+    def test_xlsxwriter_form_layout(self, xlsxwriter_form_service, tmp_path):
+        """Test the xlsxwriter form puts titles, labels and inputs on the openpyxl layout."""
+        path = tmp_path / "vehicle_form.xlsx"
+
+        assert xlsxwriter_form_service.create_form_workbook("vehicle_entry", str(path))
+
+        ws = load_workbook(path)["Form"]
+        assert ws["A1"].value == "Vehicle Entry Form"
+        assert ws["A2"].value == "Enter vehicle information"
+        assert {str(r) for r in ws.merged_cells.ranges} == {"A1:D1", "A2:D2", "A15:C15"}
+        assert [ws.cell(row=row, column=1).value for row in range(4, 14, 2)] == [
+            "Vehicle Number *",
+            "Vehicle Type *",
+            "Location *",
+            "Status *",
+            "Capacity",
+        ]
+        assert ws["C10"].value == "available"
+        assert ws["A15"].value == "Click to Submit"
+        assert ws["A17"].value == "Instructions:"
+
+        form = xlsxwriter_form_service.forms["vehicle_entry"]
+        assert [field.cell_reference for field in form.fields] == [
+            "C4",
+            "C6",
+            "C8",
+            "C10",
+            "C12",
+        ]
+
+    def test_xlsxwriter_form_protects_all_but_inputs(self, xlsxwriter_form_service, tmp_path):
+        """Test the sheet is protected while input cells stay editable."""
+        path = tmp_path / "vehicle_form.xlsx"
+
+        xlsxwriter_form_service.create_form_workbook("vehicle_entry", str(path))
+
+        ws = load_workbook(path)["Form"]
+        assert ws.protection.sheet
+        assert not ws["C4"].protection.locked
+        assert not ws["C10"].protection.locked
+        assert ws["A4"].protection.locked
+
+    def test_xlsxwriter_form_validations(self, xlsxwriter_form_service, tmp_path):
+        """Test dropdowns and field validations become matching data validations."""
+        path = tmp_path / "vehicle_form.xlsx"
+
+        xlsxwriter_form_service.create_form_workbook("vehicle_entry", str(path))
+
+        validations = validations_by_cell(load_workbook(path)["Form"])
+        assert set(validations) == {"C4", "C6", "C8", "C10", "C12"}
+
+        vehicle_number = validations["C4"]
+        assert vehicle_number.type == "textLength"
+        # "between" is the default operator, so xlsxwriter leaves it out
+        assert vehicle_number.operator is None
+        assert (vehicle_number.formula1, vehicle_number.formula2) == ("3", "20")
+        assert vehicle_number.error == "Vehicle number must be 3-20 characters"
+        assert vehicle_number.errorTitle == "Validation Error"
+
+        assert validations["C8"].type == "list"
+        assert validations["C8"].formula1 == '"Main,North,South,East,West"'
+
+        capacity = validations["C12"]
+        assert capacity.type == "whole"
+        assert capacity.operator == "greaterThan"
+        assert capacity.formula1 == "0"
+
+    def test_xlsxwriter_form_matches_openpyxl_layout(self, xlsxwriter_form_service, tmp_path):
+        """Test both engines write the same cell values."""
+        xlsxwriter_path = tmp_path / "xlsxwriter.xlsx"
+        openpyxl_path = tmp_path / "openpyxl.xlsx"
+
+        xlsxwriter_form_service.create_form_workbook("driver_entry", str(xlsxwriter_path))
+        xlsxwriter_form_service.export_engine = "openpyxl"
+        xlsxwriter_form_service.create_form_workbook("driver_entry", str(openpyxl_path))
+
+        def values(path):
+            ws = load_workbook(path)["Form"]
+            return [row for row in ws.iter_rows(values_only=True) if any(row)]
+
+        assert values(xlsxwriter_path) == values(openpyxl_path)
+
+    def test_dropdowns_with_same_options_share_validation(self, form_service, tmp_path):
+        """Test fields with identical option lists share one list validation."""
+        form = ExcelForm("shift_swap", "Shift Swap")
+        for name in ("from_location", "to_location"):
+            form.add_field(FormField(name, name, "dropdown", options=["Main", "North", "South"]))
+        form.add_field(FormField("shift", "Shift", "dropdown", options=["AM", "PM"]))
+        form_service.forms[form.form_id] = form
+        path = tmp_path / "shift_swap.xlsx"
+
+        assert form_service.create_form_workbook("shift_swap", str(path))
+
+        validations = load_workbook(path)["Form"].data_validations.dataValidation
+        by_formula = {dv.formula1: str(dv.sqref) for dv in validations}
+        assert len(validations) == 2
+        assert by_formula == {'"Main,North,South"': "C4 C6", '"AM,PM"': "C8"}
+
+    def test_dropdown_validation_does_not_absorb_field_validations(self, form_service, tmp_path):
+        """Test non-dropdown validations stay separate from the shared dropdowns."""
+        path = tmp_path / "driver_form.xlsx"
+
+        form_service.create_form_workbook("driver_entry", str(path))
+
+        validations = validations_by_cell(load_workbook(path)["Form"])
+        assert set(validations) == {"C8", "C10", "C12"}
+        assert validations["C8"].type == "list"
+        assert validations["C10"].type == "whole"
+        assert validations["C12"].formula1 == '"Standard,CDL-A,CDL-B,Chauffeur"'
+
+    def test_read_form_submission_reads_input_block(self, form_service, tmp_path, mocker):
+        """Test every input cell is read from one block, not cell by cell."""
+        path = tmp_path / "vehicle_form.xlsx"
+        form_service.create_form_workbook("vehicle_entry", str(path))
+        book = load_workbook(path)
+        ws = book["Form"]
+        ws["C4"], ws["C6"], ws["C8"], ws["C12"] = "BW123", "Van", "North", 8
+        book.save(path)
+        read_block = mocker.spy(form_service, "_read_block")
+
+        submission = form_service.read_form_submission(str(path), "vehicle_entry")
+
+        read_block.assert_called_once()
+        assert read_block.call_args.args[1:] == (4, 12, 3, 3)
+        assert submission["data"] == {
+            "vehicle_number": "BW123",
+            "vehicle_type": "Van",
+            "location": "North",
+            "status": "available",
+            "capacity": 8,
+        }
+
+    def test_read_block_xlwings_uses_one_two_dimensional_range(self, form_service, mocker):
+        """Test xlwings reads the block in one call with ndim=2, even for one cell."""
+        form_service.excel_service.use_xlwings = True
+        sheet = mocker.Mock()
+        value_range = sheet.range.return_value.options.return_value
+        value_range.value = [["BW123"]]
+
+        block = form_service._read_block(sheet, 4, 4, 3, 3)
+
+        sheet.range.assert_called_once_with((4, 3), (4, 3))
+        sheet.range.return_value.options.assert_called_once_with(ndim=2)
+        assert block == [["BW123"]]
+
+    def test_read_form_submission_xlwings_maps_block_cells(self, form_service, mocker):
+        """Test values from the xlwings block are mapped back to their fields."""
+        excel_service = form_service.excel_service
+        excel_service.use_xlwings = True
+        sheet = mocker.Mock()
+        mocker.patch.object(excel_service, "open_workbook")
+        mocker.patch.object(excel_service, "get_sheet", return_value=sheet)
+        form = form_service.forms["driver_entry"]
+        for row, field in enumerate(form.fields, start=4):
+            field.cell_reference = f"C{row}"
+        sheet.range.return_value.options.return_value.value = [
+            ["E1"],
+            ["Dana"],
+            ["Main"],
+            [3],
+            ["CDL-A"],
+        ]
+
+        submission = form_service.read_form_submission("form.xlsx", "driver_entry")
+
+        sheet.range.assert_called_once_with((4, 3), (8, 3))
+        assert submission["data"] == {
+            "employee_id": "E1",
+            "name": "Dana",
+            "location": "Main",
+            "experience_years": 3,
+            "license_type": "CDL-A",
+        }
+
+    def test_export_submissions_with_xlsxwriter(self, xlsxwriter_form_service, tmp_path, mocker):
+        """Test the xlsxwriter export writes the same table through pandas' ExcelWriter."""
+        writer = mocker.spy(pd, "ExcelWriter")
+        timestamp = datetime(2026, 1, 15, 9, 30, 45)
+        xlsxwriter_form_service.submissions = [
+            {
+                "form_id": "driver_entry",
+                "timestamp": timestamp,
+                "file_path": "driver.xlsx",
+                "is_valid": True,
+                "data": {"employee_id": "E1", "experience_years": 3},
+            },
+            {
+                "form_id": "vehicle_entry",
+                "timestamp": timestamp,
+                "file_path": "vehicle.xlsx",
+                "data": {"vehicle_number": "BW1"},
+            },
+        ]
+        path = tmp_path / "submissions.xlsx"
+
+        assert xlsxwriter_form_service.export_submissions(str(path), "driver_entry")
+
+        assert writer.call_args.kwargs["engine"] == "xlsxwriter"
+        ws = load_workbook(path).active
+        assert list(ws.iter_rows(values_only=True)) == [
+            ("Form ID", "Timestamp", "File Path", "Valid", "employee_id", "experience_years"),
+            ("driver_entry", timestamp, "driver.xlsx", True, "E1", 3),
+        ]
+        assert ws["B2"].number_format == "yyyy-mm-dd hh:mm:ss"
+
+    def test_export_submissions_engines_write_same_values(self, xlsxwriter_form_service, tmp_path):
+        """Test both export engines write identical cell values."""
+        xlsxwriter_form_service.submissions = [
+            {
+                "form_id": "vehicle_entry",
+                "timestamp": datetime(2026, 1, 15, 9, 30, 45),
+                "file_path": "vehicle.xlsx",
+                "data": {"vehicle_number": "BW1", "capacity": None},
+            }
+        ]
+        xlsxwriter_path = tmp_path / "xlsxwriter.xlsx"
+        openpyxl_path = tmp_path / "openpyxl.xlsx"
+
+        assert xlsxwriter_form_service.export_submissions(str(xlsxwriter_path))
+        xlsxwriter_form_service.export_engine = "openpyxl"
+        assert xlsxwriter_form_service.export_submissions(str(openpyxl_path))
+
+        def values(path):
+            return list(load_workbook(path).active.iter_rows(values_only=True))
+
+        assert values(xlsxwriter_path) == values(openpyxl_path)
+        assert values(xlsxwriter_path)[1][3] == "Unknown"
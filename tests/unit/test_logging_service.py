@@ -0,0 +1,100 @@
+"""Unit tests for LoggingService."""
+
+import pytest
+from loguru import logger
+
+from src.services.logging_service import LoggingService
+
+
+@pytest.fixture
+def logging_service(tmp_path):
+    """Create an initialized LoggingService writing to a temporary log file."""
+    service = LoggingService(
+        config={
+            "log_file": str(tmp_path / "app.log"),
+            "log_level": "INFO",
+            "log_format": "{level} {message}",
+        }
+    )
+    service.initialize()
+    yield service
+    service.cleanup()
+
+
+def read_log(service: LoggingService) -> str:
+    """Flush the enqueued file handler and return the log file's contents."""
+    logger.complete()
+    return service.log_file.read_text(encoding="utf-8")
+
+
+class TestLoggingService:
+    """Test suite for LoggingService."""
+
+    def test_tail_returns_last_lines(self, tmp_path):
+        """Test the tail keeps line endings and returns only the requested lines."""
+        path = tmp_path / "app.log"
+        path.write_bytes(b"one\ntwo\nthree\nfour\n")
+
+        assert LoggingService._tail(path, 2) == ["three\n", "four\n"]
+
+    def test_tail_without_trailing_newline(self, tmp_path):
+        """Test an unterminated last line is returned as a line of its own."""
+        path = tmp_path / "app.log"
+        path.write_bytes(b"one\ntwo\nthree")
+
+        assert LoggingService._tail(path, 2) == ["two\n", "three"]
+
+    def test_tail_more_lines_than_file(self, tmp_path):
+        """Test asking for more lines than the file holds returns the whole file."""
+        path = tmp_path / "app.log"
+        path.write_bytes(b"one\ntwo\n")
+
+        assert LoggingService._tail(path, 10) == ["one\n", "two\n"]
+        assert LoggingService._tail(path, 0) == []
+
+    def test_tail_empty_file(self, tmp_path):
+        """Test an empty file has no lines."""
+        path = tmp_path / "app.log"
+        path.write_bytes(b"")
+
+        assert LoggingService._tail(path, 5) == []
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 5, 64])
+    def test_tail_small_blocks(self, tmp_path, block_size):
+        """Test lines and multi-byte characters split across blocks are reassembled."""
+        path = tmp_path / "app.log"
+        content = "alpha\nbéta\n\ngamma délta\nomega\n"
+        path.write_text(content, encoding="utf-8")
+        expected = content.splitlines(keepends=True)
+
+        for lines in range(1, 7):
+            assert LoggingService._tail(path, lines, block_size) == expected[-lines:]
+
+    def test_set_level_keeps_handlers(self, logging_service, mocker):
+        """Test a level change applies to existing handlers without re-adding them."""
+        handlers = list(logging_service.handlers)
+        add = mocker.spy(logger, "add")
+        remove = mocker.spy(logger, "remove")
+
+        logging_service.set_level("WARNING")
+        logger.info("hidden info")
+        logger.warning("shown warning")
+        logging_service.set_level("DEBUG")
+        logger.debug("shown debug")
+
+        add.assert_not_called()
+        remove.assert_not_called()
+        assert logging_service.handlers == handlers
+        contents = read_log(logging_service)
+        assert "hidden info" not in contents
+        assert "WARNING shown warning" in contents
+        assert "DEBUG shown debug" in contents
+
+    def test_disabled_helpers_skip_loguru(self, logging_service, mocker):
+        """Test helpers below the current level return before reaching loguru."""
+        emit = mocker.patch.object(LoggingService, "_emit")
+
+        logging_service.debug("skipped")
+        logging_service.info("sent")
+
+        emit.assert_called_once_with("INFO", "sent", {})
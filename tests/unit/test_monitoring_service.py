@@ -0,0 +1,243 @@
+"""Unit tests for MonitoringService metrics and alerting."""
+
+import csv
+import json
+import queue
+import smtplib
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services.monitoring_service import Alert, MonitoringService, PerformanceMetric
+
+
+@pytest.fixture
+def smtp_mock(mocker):
+    """Patch smtplib.SMTP and return the mocked class."""
+    smtp_cls = mocker.patch("smtplib.SMTP")
+    smtp_cls.return_value.noop.return_value = (250, b"OK")
+    return smtp_cls
+
+
+@pytest.fixture
+def monitoring_service(tmp_path):
+    """Create a MonitoringService with default config and email credentials."""
+    service = MonitoringService(config_path=tmp_path / "monitoring.json")
+    service.config.update(email_username="user", email_password="secret")
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def fake_monotonic(mocker):
+    """Patch time.monotonic with a settable clock; return the one-item time list."""
+    now = [1000.0]
+    mocker.patch("time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def make_alert(title: str = "Memory Usage Threshold Exceeded") -> Alert:
+    """Build a warning alert for the memory_usage metric."""
+    return Alert(
+        severity="warning",
+        title=title,
+        message="memory_usage is 1500 MB",
+        timestamp=datetime.now(),
+        metric_name="memory_usage",
+        current_value=1500.0,
+        threshold=1024.0,
+    )
+
+
+class TestMonitoringService:
+    """Test suite for MonitoringService."""
+
+    def test_alert_emails_reuse_connection(self, monitoring_service, smtp_mock):
+        """Test consecutive alert emails share one SMTP connection."""
+        monitoring_service._send_email_alert(make_alert("First"))
+        monitoring_service._send_email_alert(make_alert("Second"))
+
+        smtp_mock.assert_called_once_with("localhost", 587)
+        smtp_mock.return_value.login.assert_called_once_with("user", "secret")
+        assert smtp_mock.return_value.send_message.call_count == 2
+
+    def test_stale_connection_is_replaced(self, monitoring_service, smtp_mock):
+        """Test a connection failing the NOOP check is closed and reopened."""
+        monitoring_service._send_email_alert(make_alert())
+        smtp_mock.return_value.noop.side_effect = smtplib.SMTPServerDisconnected()
+
+        monitoring_service._send_email_alert(make_alert())
+
+        assert smtp_mock.call_count == 2
+        smtp_mock.return_value.quit.assert_called_once()
+
+    def test_disconnect_during_send_is_retried_once(self, monitoring_service, smtp_mock):
+        """Test a connection dropped mid-send is reopened and the alert resent."""
+        smtp_mock.return_value.send_message.side_effect = [
+            smtplib.SMTPServerDisconnected(),
+            None,
+        ]
+
+        monitoring_service._send_email_alert(make_alert())
+
+        assert smtp_mock.call_count == 2
+        assert smtp_mock.return_value.send_message.call_count == 2
+
+    def test_rejected_alert_is_not_resent(self, monitoring_service, smtp_mock):
+        """Test an SMTP rejection is logged without resending or reconnecting."""
+        smtp_mock.return_value.send_message.side_effect = smtplib.SMTPRecipientsRefused({})
+
+        monitoring_service._send_email_alert(make_alert())
+
+        smtp_mock.assert_called_once()
+        smtp_mock.return_value.send_message.assert_called_once()
+
+    def test_bad_credentials_log_in_once(self, monitoring_service, smtp_mock):
+        """Test an authentication failure is not retried."""
+        smtp_mock.return_value.login.side_effect = smtplib.SMTPAuthenticationError(535, b"no")
+
+        monitoring_service._send_email_alert(make_alert())
+
+        smtp_mock.return_value.login.assert_called_once()
+        smtp_mock.return_value.send_message.assert_not_called()
+        assert monitoring_service._smtp is None
+
+    def test_alert_cooldown_suppresses_repeat_alerts(self, monitoring_service, fake_monotonic):
+        """Test an alert id that fired within alert_cooldown is suppressed until it expires."""
+        monitoring_service.record_metric("memory_usage", 1500.0, "MB")
+        assert monitoring_service.resolve_alert("memory_usage_warning")
+
+        fake_monotonic[0] += monitoring_service.config["alert_cooldown"] - 1
+        monitoring_service.record_metric("memory_usage", 1600.0, "MB")
+        assert "memory_usage_warning" not in monitoring_service.active_alerts
+        assert len(monitoring_service.alert_history) == 1
+
+        fake_monotonic[0] += 1
+        monitoring_service.record_metric("memory_usage", 1700.0, "MB")
+        assert monitoring_service.active_alerts["memory_usage_warning"].current_value == 1700.0
+        assert len(monitoring_service.alert_history) == 2
+
+    @pytest.mark.usefixtures("fake_monotonic")
+    def test_cooldown_is_per_alert_id(self, monitoring_service):
+        """Test a cooling-down warning does not suppress the critical alert."""
+        monitoring_service.record_metric("memory_usage", 1500.0, "MB")
+        monitoring_service.record_metric("memory_usage", 2500.0, "MB")
+
+        assert set(monitoring_service.active_alerts) == {
+            "memory_usage_warning",
+            "memory_usage_critical",
+        }
+
+    def test_expired_metrics_are_dropped_from_the_old_end(self, monitoring_service):
+        """Test recording a metric evicts entries older than metrics_ttl."""
+        stale = datetime.now() - monitoring_service.metrics_ttl - timedelta(minutes=1)
+        monitoring_service.metrics_cache.extend(
+            PerformanceMetric(name="old", value=1.0, timestamp=stale, unit="count")
+            for _ in range(3)
+        )
+
+        monitoring_service.record_metric("new", 2.0)
+
+        assert [m.name for m in monitoring_service.metrics_cache] == ["new"]
+        assert monitoring_service.get_buffer_stats()["metrics_ring_overwrites"] == 0
+
+    def test_full_metric_buffer_counts_overwrites(self, monitoring_service):
+        """Test metrics evicted by a full buffer are counted as overwrites."""
+        monitoring_service.metrics_cache = deque(maxlen=3)
+
+        for value in range(5):
+            monitoring_service.record_metric("requests", float(value))
+
+        assert [m.value for m in monitoring_service.metrics_cache] == [2.0, 3.0, 4.0]
+        stats = monitoring_service.get_buffer_stats()
+        assert stats["metrics_ring_writes"] == 5
+        assert stats["metrics_ring_overwrites"] == 2
+        assert stats["metrics_ring_capacity"] == 3
+        assert stats["metrics_ring_fill"] == 3
+
+    def test_full_alert_queue_drops_oldest(self, monitoring_service, mocker):
+        """Test enqueueing onto a full alert queue drops and counts the oldest alert."""
+        monitoring_service._alert_queue = queue.Queue(maxsize=2)
+        # Stand-in sender so the queue is not drained by a real thread
+        monitoring_service._alert_sender = mocker.Mock()
+
+        for title in ("First", "Second", "Third"):
+            monitoring_service._enqueue_email_alert(make_alert(title))
+
+        pending = [monitoring_service._alert_queue.get_nowait().title for _ in range(2)]
+        monitoring_service._alert_sender = None
+        assert pending == ["Second", "Third"]
+        assert monitoring_service.alert_drops == 1
+        assert monitoring_service.get_buffer_stats()["alert_queue_drops"] == 1
+
+    def test_resolved_alert_leaves_active_alerts(self, monitoring_service):
+        """Test resolving removes the alert from active_alerts but keeps it in history."""
+        monitoring_service.record_metric("memory_usage", 1500.0, "MB")
+
+        assert monitoring_service.resolve_alert("memory_usage_warning")
+        assert not monitoring_service.resolve_alert("memory_usage_warning")
+        assert monitoring_service.active_alerts == {}
+        assert monitoring_service.alert_history[-1].resolved
+
+    def test_alert_summary_counts_todays_alerts(self, monitoring_service):
+        """Test the summary counts alerts created today, including resolved ones."""
+        monitoring_service.record_metric("memory_usage", 1500.0, "MB")
+        monitoring_service.record_metric("allocation_time", 45.0, "seconds")
+        monitoring_service.resolve_alert("memory_usage_warning")
+
+        summary = monitoring_service.get_alert_summary()
+
+        assert summary["active_alerts"] == 1
+        assert summary["total_alerts_today"] == 2
+        assert summary["active_by_severity"] == {"critical": 1}
+
+    def test_alert_summary_resets_on_a_new_day(self, monitoring_service):
+        """Test alerts from a previous day are not counted as today's."""
+        monitoring_service.record_metric("memory_usage", 1500.0, "MB")
+        yesterday = datetime.now().date() - timedelta(days=1)
+        monitoring_service._alerts_today = (yesterday, 5)
+
+        assert monitoring_service.get_alert_summary()["total_alerts_today"] == 0
+
+    def test_export_metrics_json(self, monitoring_service, tmp_path):
+        """Test the JSON export is one document with a record per line."""
+        monitoring_service.record_metric("requests", 3.0, tags={"service": "excel"})
+        monitoring_service.record_metric("memory_usage", 1500.0, "MB")
+        path = tmp_path / "metrics.json"
+
+        monitoring_service.export_metrics(path, "json")
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert set(data) == {"export_timestamp", "metrics", "alerts"}
+        assert [(m["name"], m["value"], m["unit"]) for m in data["metrics"]] == [
+            ("requests", 3.0, "count"),
+            ("memory_usage", 1500.0, "MB"),
+        ]
+        assert data["metrics"][0]["tags"] == {"service": "excel"}
+        assert data["alerts"][0]["severity"] == "warning"
+        assert data["alerts"][0]["resolved"] is False
+        # Each metric and alert record starts its own line
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [line.split(":", 1)[0] for line in lines[1:]] == [
+            '{"name"',
+            '{"name"',
+            '{"severity"',
+        ]
+
+    def test_export_metrics_csv(self, monitoring_service, tmp_path):
+        """Test the CSV export adds tag columns in first-seen order."""
+        monitoring_service.record_metric("requests", 3.0, tags={"service": "excel"})
+        monitoring_service.record_metric("latency", 0.2, "seconds", tags={"host": "a"})
+        path = tmp_path / "metrics.csv"
+
+        monitoring_service.export_metrics(path, "csv")
+
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        assert reader.fieldnames == ["timestamp", "name", "value", "unit", "service", "host"]
+        assert [(r["name"], r["value"], r["service"], r["host"]) for r in rows] == [
+            ("requests", "3.0", "excel", ""),
+            ("latency", "0.2", "", "a"),
+        ]